@@ -1,90 +1,213 @@
-from datetime import datetime, timedelta
-from typing import Optional, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from datetime import timedelta
+from typing import Literal, Optional, Tuple, Union
+from cachetools import TTLCache
+from cryptography.hazmat.primitives import serialization
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
 from app.models.user import User, UserRole
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import bcrypt
+import hashlib
+import jwt
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token security
 security = HTTPBearer()
 
 
+def _load_jwt_keys():
+    """Resolve the JWT signing and verification keys once, at import"""
+    if settings.ALGORITHM.startswith("HS"):
+        return settings.SECRET_KEY, settings.SECRET_KEY
+
+    with open(settings.JWT_PRIVATE_KEY_PATH, "rb") as key_file:
+        private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+
+    if settings.JWT_PUBLIC_KEY_PATH:
+        with open(settings.JWT_PUBLIC_KEY_PATH, "rb") as key_file:
+            public_key = serialization.load_pem_public_key(key_file.read())
+    else:
+        public_key = private_key.public_key()
+
+    return private_key, public_key
+
+
+# Parsed key objects are reused so PEM data isn't re-read per token
+_signing_key, _verification_key = _load_jwt_keys()
+
+# Settings used on every token/password operation, bound once
+_ALGORITHM = settings.ALGORITHM
+_ALGORITHMS = [settings.ALGORITHM]
+_ACCESS_TOKEN_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_EXPIRE_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+_BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+
+# bcrypt releases the GIL, so a thread pool lets logins hash in parallel
+# without blocking the event loop
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+# Verified against when the employee_id is unknown so that a miss costs the
+# same bcrypt work as a wrong password and doesn't reveal which IDs exist
+_DUMMY_HASH = bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode()
+
+# Decoded payloads of recently verified tokens, keyed by sha256(token)
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+# Detached User rows of recently authenticated users, keyed by employee_id.
+# Each request gets its own copy merged into its session without a SELECT.
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+_user_cache_lock = threading.Lock()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed or non-bcrypt hash stored for this user
+        return False
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode()
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt pool so the event loop stays responsive"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool so the event loop stays responsive"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, verify_password, plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash's bcrypt cost differs from BCRYPT_ROUNDS, so changing
+    the setting takes effect for existing users at their next login"""
+    try:
+        return int(hashed_password.split("$")[2]) != _BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
+    # Integer epoch seconds avoid datetime construction on every token
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + _ACCESS_TOKEN_EXPIRE_SECONDS
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key, algorithm=_ALGORITHM)
     return encoded_jwt
 
 
 def create_refresh_token(data: dict) -> str:
     """Create JWT refresh token"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = int(time.time()) + _REFRESH_TOKEN_EXPIRE_SECONDS
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key, algorithm=_ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
-    """Verify JWT token with detailed error logging"""
+def invalidate_user_cache(employee_id: str) -> None:
+    """Drop a cached user so the next request reloads it from the database"""
+    with _user_cache_lock:
+        _user_cache.pop(employee_id, None)
+
+
+def invalidate_user_cache_by_id(user_id: int) -> None:
+    """Same as invalidate_user_cache, for callers that only know the primary key"""
+    with _user_cache_lock:
+        for employee_id, cached_user in list(_user_cache.items()):
+            if cached_user.id == user_id:
+                del _user_cache[employee_id]
+
+
+def verify_token_with_reason(
+    token: str, token_type: str = "access"
+) -> Tuple[Optional[dict], Literal["ok", "expired", "bad_type", "invalid"]]:
+    """Verify JWT token and report why verification failed, decoding at most once"""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        payload = _token_cache.get(cache_key)
+
+    if payload is not None:
+        # A cached payload already passed signature checks, so once past
+        # its exp we know it's expired without decoding again
+        if payload.get("exp", 0) <= time.time():
+            with _token_cache_lock:
+                _token_cache.pop(cache_key, None)
+            logger.warning("JWT token has expired")
+            return None, "expired"
+        if payload.get("type") != token_type:
+            logger.warning(f"Token type mismatch: expected {token_type}, got {payload.get('type')}")
+            return None, "bad_type"
+        return payload, "ok"
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _verification_key, algorithms=_ALGORITHMS)
+
+        # Successful verifications only; failures are never cached
+        with _token_cache_lock:
+            _token_cache[cache_key] = payload
+
         if payload.get("type") != token_type:
             logger.warning(f"Token type mismatch: expected {token_type}, got {payload.get('type')}")
-            return None
+            return None, "bad_type"
 
         # Check if token is about to expire (within 30 minutes)
         exp = payload.get("exp")
         if exp:
-            exp_datetime = datetime.fromtimestamp(exp)
-            time_until_expiry = exp_datetime - datetime.utcnow()
-            if time_until_expiry.total_seconds() < 1800:  # 30 minutes
-                logger.info(f"Token expires in {time_until_expiry.total_seconds()/60:.1f} minutes")
+            seconds_until_expiry = exp - time.time()
+            if seconds_until_expiry < 1800:  # 30 minutes
+                logger.info(f"Token expires in {seconds_until_expiry/60:.1f} minutes")
 
-        return payload
+        return payload, "ok"
     except jwt.ExpiredSignatureError:
         logger.warning("JWT token has expired")
-        return None
-    except JWTError as e:
+        return None, "expired"
+    except jwt.InvalidTokenError as e:
         logger.error(f"JWT verification error: {e}")
-        return None
+        return None, "invalid"
     except Exception as e:
         logger.error(f"Token verification error: {e}")
-        return None
+        return None, "invalid"
+
 
+def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
+    """Verify JWT token with detailed error logging"""
+    payload, _ = verify_token_with_reason(token, token_type)
+    return payload
 
-def authenticate_user(db: Session, employee_id: str, password: str) -> Optional[User]:
+
+async def authenticate_user(db: AsyncSession, employee_id: str, password: str) -> Optional[User]:
     """Authenticate user with employee_id and password"""
-    user = db.query(User).filter(User.employee_id == employee_id).first()
+    user = (await db.execute(select(User).where(User.employee_id == employee_id))).scalar_one_or_none()
+    password_hash = user.password_hash if user else _DUMMY_HASH
+    password_ok = await verify_password_async(password, password_hash)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not password_ok:
         return None
     if not user.is_active:
         return None
@@ -99,21 +222,15 @@ def get_current_user(
 
     try:
         token = credentials.credentials
-        payload = verify_token(token, "access")
+        payload, reason = verify_token_with_reason(token, "access")
 
         if payload is None:
-            # Check if token is expired specifically
-            try:
-                expired_payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_exp": False})
-                if expired_payload.get("type") == "access":
-                    logger.warning(f"Expired token for user: {expired_payload.get('sub')}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token has expired. Please login again.",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-            except:
-                pass
+            if reason == "expired":
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token has expired. Please login again.",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
 
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -132,7 +249,7 @@ def get_current_user(
 
     except HTTPException:
         raise
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         logger.error(f"JWT error in get_current_user: {e}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -140,7 +257,21 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.employee_id == employee_id).first()
+    with _user_cache_lock:
+        cached_user = _user_cache.get(employee_id)
+
+    if cached_user is not None:
+        user = db.merge(cached_user, load=False)
+    else:
+        user = db.execute(select(User).where(User.employee_id == employee_id)).scalar_one_or_none()
+        if user is not None and user.is_active:
+            # Keep a detached snapshot for later requests and hand this one
+            # a session-bound copy so route handlers can still modify it
+            db.expunge(user)
+            with _user_cache_lock:
+                _user_cache[employee_id] = user
+            user = db.merge(user, load=False)
+
     if user is None:
         logger.warning(f"User not found for employee_id: {employee_id}")
         raise HTTPException(
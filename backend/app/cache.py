@@ -0,0 +1,133 @@
+from datetime import date
+from typing import Any, Optional
+from redis.exceptions import RedisError
+from app.config import settings
+import logging
+import orjson
+import redis.asyncio as redis
+import time
+
+logger = logging.getLogger(__name__)
+
+# All response-cache keys live under this prefix
+CACHE_PREFIX = "hal-cache"
+
+# After a failed Redis call, skip the cache for this long instead of paying
+# a connection timeout on every request
+REDIS_RETRY_AFTER_SECONDS = 30
+
+# Also used by app.trip_locations, so both share one circuit breaker
+redis_client = redis.from_url(
+    settings.REDIS_URL,
+    socket_connect_timeout=0.5,
+    socket_timeout=0.5,
+    decode_responses=True
+)
+_redis_unavailable_until = 0.0
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a namespaced cache key"""
+    return ":".join([CACHE_PREFIX, *(str(part) for part in parts)])
+
+
+def redis_available() -> bool:
+    return time.monotonic() >= _redis_unavailable_until
+
+
+def mark_redis_unavailable(error: Exception) -> None:
+    global _redis_unavailable_until
+    _redis_unavailable_until = time.monotonic() + REDIS_RETRY_AFTER_SECONDS
+    logger.warning(f"Redis cache unavailable, bypassing for {REDIS_RETRY_AFTER_SECONDS}s: {error}")
+
+
+async def cache_get_raw(key: str) -> Optional[str]:
+    """Return the cached JSON text for key undecoded, or None on a miss or Redis error"""
+    if not redis_available():
+        return None
+    try:
+        return await redis_client.get(key)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached JSON value for key, or None on a miss or Redis error"""
+    value = await cache_get_raw(key)
+    return orjson.loads(value) if value is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store a JSON-serializable value for ttl seconds"""
+    if not redis_available():
+        return
+    try:
+        # orjson writes dates and datetimes as ISO strings, matching how
+        # ORJSONResponse renders the same value uncached
+        await redis_client.set(key, orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS), ex=ttl)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Invalidate cached values after the data behind them changes"""
+    if not keys or not redis_available():
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+
+
+# Admin dashboard entries, shared here so routes outside the admin module can
+# invalidate them when requests change
+DASHBOARD_CACHE_KEY = cache_key("admin", "dashboard-stats")
+# Present while the dashboard stats are fresh. Invalidation drops only this
+# marker, so the stats themselves can still stand in for a failing query.
+DASHBOARD_FRESH_CACHE_KEY = cache_key("admin", "dashboard-stats", "fresh")
+RESOURCE_AVAILABILITY_CACHE_KEY = cache_key("admin", "resource-availability")
+
+
+def available_resources_cache_key(request_date: date) -> str:
+    """Free vehicles/drivers depend only on the request's date, so requests share an entry per day"""
+    return cache_key("admin", "available-resources", request_date.isoformat())
+
+
+def analytics_dashboard_cache_key(day: date) -> str:
+    """Analytics dashboard figures are relative to today, so they're cached per day"""
+    return cache_key("analytics", "dashboard", day.isoformat())
+
+
+def driver_count_cache_key(is_active: Optional[bool], is_available: Optional[bool]) -> str:
+    """Driver list total for one combination of its filters"""
+    return cache_key("drivers", "count", is_active, is_available)
+
+
+# Every filter combination the driver list can be called with
+DRIVER_COUNT_CACHE_KEYS = [
+    driver_count_cache_key(is_active, is_available)
+    for is_active in (None, True, False)
+    for is_available in (None, True, False)
+]
+
+
+async def invalidate_driver_count_cache() -> None:
+    """Drop cached driver list totals after drivers are added, changed or removed"""
+    await cache_delete(*DRIVER_COUNT_CACHE_KEYS)
+
+
+async def invalidate_dashboard_cache(*request_dates: date) -> None:
+    """
+    Drop cached dashboard counters after requests or assignments change,
+    along with the available-resources lists of any affected request dates
+    and the driver list totals, since assignments flip driver availability.
+    The admin stats are only marked stale, keeping their last copy as a fallback.
+    """
+    await cache_delete(
+        DASHBOARD_FRESH_CACHE_KEY,
+        RESOURCE_AVAILABILITY_CACHE_KEY,
+        analytics_dashboard_cache_key(date.today()),
+        *DRIVER_COUNT_CACHE_KEYS,
+        *(available_resources_cache_key(request_date) for request_date in set(request_dates))
+    )
@@ -6,17 +6,36 @@ import os
 class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./hal_transport_system.db"
+    ASYNC_DATABASE_URL: str = ""  # Derived from DATABASE_URL (aiosqlite/aiomysql) when empty
     DB_HOST: str = "localhost"
     DB_PORT: int = 3306
     DB_USER: str = "root"
     DB_PASSWORD: str = "password"
     DB_NAME: str = "hal_transport_system"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # Seconds; keep below MySQL's wait_timeout
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before erroring
+    DB_POOL_PRE_PING: bool = False  # Enable behind proxies/failover that drop idle connections
+    SQL_ECHO: bool = False  # Log every SQL statement (independent of DEBUG)
+    DAILY_STATS_REFRESH_SECONDS: int = 600  # How often the analytics rollup is rebuilt
+    DAILY_STATS_REFRESH_DAYS: int = 7  # Past days each rebuild covers, on top of future dates
+    DAILY_STATS_FULL_REFRESH_SECONDS: int = 86400  # How often the whole rollup is rebuilt, older dates included
     
     # JWT Configuration
     SECRET_KEY: str = "your-super-secret-key-change-this-in-production"
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS* signs with SECRET_KEY; asymmetric ones (e.g. EdDSA) use the PEM key files below
+    JWT_PRIVATE_KEY_PATH: str = ""
+    JWT_PUBLIC_KEY_PATH: str = ""  # Derived from the private key when empty
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480  # 8 hours for production use
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # 30 days for refresh tokens
+    TOKEN_CACHE_TTL_SECONDS: int = 30  # How long a verified token payload is reused
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60  # How long an authenticated user row is reused
+    USER_CACHE_MAXSIZE: int = 5000
+
+    # Password Hashing
+    BCRYPT_ROUNDS: int = 12  # Tune so a single hash takes ~100 ms on the target host
     
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -46,6 +65,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        frozen = True  # Read from the environment once at import; never mutated
 
 
 # Create settings instance
@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
 import logging
 
@@ -13,15 +15,53 @@ logger = logging.getLogger(__name__)
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=settings.DEBUG  # Log SQL queries in debug mode
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Off by default: stale connections are retired by pool_recycle instead
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_use_lifo=True,  # Reuse the most recently returned (warm) connection
+    echo=settings.SQL_ECHO,  # Opt-in SQL logging; too costly to follow DEBUG
+    echo_pool=False,
+    future=True
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+# Async driver for each sync dialect we deploy on
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url() -> str:
+    """ASYNC_DATABASE_URL if set, otherwise DATABASE_URL with its async driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).render_as_string(hide_password=False)
+
+
+# Async engine for endpoints that await their queries instead of blocking
+# the event loop; same pool settings as the sync engine
+async_engine = create_async_engine(
+    get_async_database_url(),
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_use_lifo=True,
+    echo=settings.SQL_ECHO,
+    echo_pool=False
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class for models
 Base = declarative_base()
@@ -45,6 +85,25 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency to get an async database session
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            await db.rollback()
+            raise
+
+
+async def fetch_rows(statement):
+    """Run a read-only statement on its own session so several can be awaited concurrently"""
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(statement)).all()
+
+
 def init_db():
     """
     Initialize database tables
@@ -52,6 +111,7 @@ def init_db():
     try:
         # Import all models to ensure they are registered with Base
         from app.models import user, vehicle, driver, transport_request, vehicle_assignment
+        from app import rollups
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
@@ -1,21 +1,71 @@
 import random
 import math
+from collections import deque
+import numpy as np
 from typing import List, Dict, Tuple
-from dataclasses import dataclass
-from datetime import datetime, time
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Higher value = served first
+PRIORITY_ORDER = {'urgent': 4, 'high': 3, 'medium': 2, 'low': 1}
 
-@dataclass
+# Schedules in the optimization response start at 09:00
+ROUTE_START_TIME = datetime(1900, 1, 1, 9, 0)
+STOP_INTERVAL = timedelta(minutes=15)  # Travel time between stops
+STOP_DWELL = timedelta(minutes=5)  # Time spent at each stop
+
+# Earth's radius in kilometers
+EARTH_RADIUS_KM = 6371
+
+# Simplified coordinates for known Bangalore locations
+LOCATION_COORDS = {
+    "HAL Main Gate": (12.9716, 77.5946),
+    "Electronic City": (12.8456, 77.6603),
+    "Whitefield": (12.9698, 77.7500),
+    "Koramangala": (12.9352, 77.6245),
+    "Indiranagar": (12.9784, 77.6408),
+    "Jayanagar": (12.9279, 77.5937),
+    "Banashankari": (12.9249, 77.5657),
+    "Marathahalli": (12.9591, 77.6974),
+    "BTM Layout": (12.9165, 77.6101),
+    "HSR Layout": (12.9082, 77.6476)
+}
+DEFAULT_COORDS = LOCATION_COORDS["HAL Main Gate"]
+
+
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in km between two points given in radians
+    """
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _parse_hhmm(value: str) -> time:
+    """
+    Parse an 'HH:MM' string without going through strptime
+    """
+    hours, minutes = value.split(':')
+    return time(int(hours), int(minutes))
+
+
+@dataclass(slots=True, frozen=True)
 class Location:
     name: str
     lat: float = 0.0
     lng: float = 0.0
+    # Resolved (lat, lng) in radians, filled in once at construction
+    rad: Tuple[float, float] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        lat, lng = LOCATION_COORDS.get(self.name, (self.lat or DEFAULT_COORDS[0], self.lng or DEFAULT_COORDS[1]))
+        object.__setattr__(self, 'rad', (math.radians(lat), math.radians(lng)))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TransportRequest:
     id: int
     origin: Location
@@ -25,7 +75,7 @@ class TransportRequest:
     request_time: time
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Vehicle:
     id: int
     capacity: int
@@ -50,42 +100,43 @@ class RouteOptimizer:
     
     def __init__(self):
         # Simplified distance matrix for Bangalore locations
-        self.location_coords = {
-            "HAL Main Gate": (12.9716, 77.5946),
-            "Electronic City": (12.8456, 77.6603),
-            "Whitefield": (12.9698, 77.7500),
-            "Koramangala": (12.9352, 77.6245),
-            "Indiranagar": (12.9784, 77.6408),
-            "Jayanagar": (12.9279, 77.5937),
-            "Banashankari": (12.9249, 77.5657),
-            "Marathahalli": (12.9591, 77.6974),
-            "BTM Layout": (12.9165, 77.6101),
-            "HSR Layout": (12.9082, 77.6476)
+        self.location_coords = LOCATION_COORDS
+
+        # Distances between the known locations never change, so compute them once
+        names = list(self.location_coords)
+        matrix = self._distance_matrix([Location(name) for name in names])
+        self._dist_table: Dict[Tuple[str, str], float] = {
+            (name1, name2): float(matrix[i, j])
+            for i, name1 in enumerate(names)
+            for j, name2 in enumerate(names)
         }
     
     def calculate_distance(self, loc1: Location, loc2: Location) -> float:
         """
         Calculate distance between two locations using simplified coordinates
         """
-        # Get coordinates or use default
-        coord1 = self.location_coords.get(loc1.name, (loc1.lat or 12.9716, loc1.lng or 77.5946))
-        coord2 = self.location_coords.get(loc2.name, (loc2.lat or 12.9716, loc2.lng or 77.5946))
-        
-        # Haversine formula for distance calculation
-        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth's radius in kilometers
-        r = 6371
-        
-        return c * r
+        distance = self._dist_table.get((loc1.name, loc2.name))
+        if distance is not None:
+            return distance
+
+        # Haversine formula on the coordinates resolved when the Locations were built
+        return _haversine(*loc1.rad, *loc2.rad)
     
+    def _distance_matrix(self, locations: List[Location]) -> np.ndarray:
+        """
+        Calculate pairwise Haversine distances (km) between locations in one vectorized pass
+        """
+        coords = np.array([loc.rad for loc in locations], dtype=np.float64)
+        lats = coords[:, 0]
+        lons = coords[:, 1]
+
+        dlat = lats[:, None] - lats[None, :]
+        dlon = lons[:, None] - lons[None, :]
+
+        a = np.sin(dlat / 2) ** 2 + np.cos(lats[:, None]) * np.cos(lats[None, :]) * np.sin(dlon / 2) ** 2
+
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
     def calculate_route_distance(self, route: List[Location]) -> float:
         """
         Calculate total distance for a route
@@ -112,29 +163,27 @@ class RouteOptimizer:
         # Start from vehicle's current location
         route = [vehicle.current_location]
         
-        # Collect all unique locations
-        locations = set()
-        for req in requests:
-            locations.add((req.origin.name, req.origin))
-            locations.add((req.destination.name, req.destination))
+        # Collect all unique locations, keeping first-seen order
+        locations = dict.fromkeys(
+            loc for req in requests for loc in (req.origin, req.destination)
+        )
         
         # Remove current location if it's already in the set
-        locations = [loc[1] for loc in locations if loc[1].name != vehicle.current_location.name]
+        locations.pop(vehicle.current_location, None)
+        locations = list(locations)
         
-        # Simple nearest neighbor algorithm for route optimization
-        current_location = vehicle.current_location
-        remaining_locations = locations.copy()
+        # Simple nearest neighbor algorithm for route optimization.
+        # Index 0 of the distance matrix is the vehicle's starting point.
+        distances = self._distance_matrix([vehicle.current_location] + locations)
+        visited = np.zeros(len(locations) + 1, dtype=bool)
+        visited[0] = True
+        current_index = 0
         
-        while remaining_locations:
-            # Find nearest location
-            nearest_location = min(
-                remaining_locations,
-                key=lambda loc: self.calculate_distance(current_location, loc)
-            )
-            
-            route.append(nearest_location)
-            remaining_locations.remove(nearest_location)
-            current_location = nearest_location
+        for _ in range(len(locations)):
+            # Find nearest unvisited location
+            current_index = int(np.argmin(np.where(visited, np.inf, distances[current_index])))
+            visited[current_index] = True
+            route.append(locations[current_index - 1])
         
         return route
     
@@ -170,7 +219,7 @@ class RouteOptimizer:
                     destination=Location(req['destination']),
                     passenger_count=req['passenger_count'],
                     priority=req['priority'],
-                    request_time=datetime.strptime(req.get('request_time', '09:00'), '%H:%M').time()
+                    request_time=_parse_hhmm(req.get('request_time', '09:00'))
                 ))
             
             available_vehicles = []
@@ -184,29 +233,30 @@ class RouteOptimizer:
             
             # Simple assignment algorithm
             assignments = []
-            unassigned_requests = transport_requests.copy()
+
+            # Sort by priority (urgent first) once; the order is the same for every vehicle
+            pending_requests = deque(sorted(
+                transport_requests,
+                key=lambda r: PRIORITY_ORDER.get(r.priority, 1),
+                reverse=True
+            ))
             
             for vehicle in available_vehicles:
-                if not unassigned_requests:
+                if not pending_requests:
                     break
                 
                 # Group requests that can fit in this vehicle
                 vehicle_requests = []
                 remaining_capacity = vehicle.capacity
                 
-                # Sort by priority (urgent first)
-                priority_order = {'urgent': 4, 'high': 3, 'medium': 2, 'low': 1}
-                sorted_requests = sorted(
-                    unassigned_requests,
-                    key=lambda r: priority_order.get(r.priority, 1),
-                    reverse=True
-                )
-                
-                for req in sorted_requests:
+                # Scan the queue once; requests that don't fit go back in the same order
+                for _ in range(len(pending_requests)):
+                    req = pending_requests.popleft()
                     if req.passenger_count <= remaining_capacity:
                         vehicle_requests.append(req)
                         remaining_capacity -= req.passenger_count
-                        unassigned_requests.remove(req)
+                    else:
+                        pending_requests.append(req)
                 
                 if vehicle_requests:
                     # Create route for this vehicle
@@ -228,19 +278,16 @@ class RouteOptimizer:
                     
                     assignments.append(assignment)
             
+            unassigned_ids = {req.id for req in pending_requests}
+
             # Convert to response format
             optimized_assignments = []
             for assignment in assignments:
                 route_data = []
                 for i, location in enumerate(assignment.route):
                     # Estimate arrival and departure times
-                    base_time = datetime.strptime("09:00", "%H:%M")
-                    travel_time_minutes = i * 15  # 15 minutes between stops
-                    arrival_time = base_time.replace(
-                        minute=(base_time.minute + travel_time_minutes) % 60,
-                        hour=base_time.hour + (base_time.minute + travel_time_minutes) // 60
-                    )
-                    departure_time = arrival_time.replace(minute=(arrival_time.minute + 5) % 60)
+                    arrival_time = ROUTE_START_TIME + i * STOP_INTERVAL
+                    departure_time = arrival_time + STOP_DWELL
                     
                     route_data.append({
                         "location": location.name,
@@ -260,7 +307,7 @@ class RouteOptimizer:
             return {
                 "optimized_assignments": optimized_assignments,
                 "optimization_time_ms": 245,  # Simulated processing time
-                "unassigned_requests": [req.id for req in unassigned_requests]
+                "unassigned_requests": [req.id for req in transport_requests if req.id in unassigned_ids]
             }
             
         except Exception as e:
@@ -0,0 +1,144 @@
+from sqlalchemy import Column, Date, Enum, Index, Integer, String, Table, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from typing import Optional
+from datetime import date, timedelta
+from app.config import settings
+from app.database import Base, async_engine
+from app.models.transport_request import TransportRequest, RequestStatus
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Per-day request counts by status and route, so reports over a date range
+# read a row per day and route instead of every request. Every
+# DAILY_STATS_REFRESH_SECONDS the last DAILY_STATS_REFRESH_DAYS days and all
+# future dates are rebuilt from transport_requests, so recent data lags by at
+# most that long. Older requests are rarely edited; a full rebuild every
+# DAILY_STATS_FULL_REFRESH_SECONDS, and whenever the rollup is empty, picks up
+# changes to them.
+daily_request_stats = Table(
+    "daily_request_stats",
+    Base.metadata,
+    Column("stat_date", Date, nullable=False),
+    Column("status", Enum(RequestStatus)),
+    Column("origin", String(255), nullable=False),
+    Column("destination", String(255), nullable=False),
+    Column("request_count", Integer, nullable=False),
+    # Requests with a passenger count, so averages skip NULLs like AVG() does
+    Column("passenger_requests", Integer, nullable=False),
+    Column("passenger_count", Integer),
+    # One row per day, status and route; should two rebuilds ever overlap,
+    # the second fails on this key instead of doubling the counts
+    Index("ix_daily_request_stats_date_status_route", "stat_date", "status", "origin", "destination", unique=True)
+)
+
+
+async def refresh_daily_request_stats(since: Optional[date] = None) -> None:
+    """
+    Rebuild the rollup rows dated since onwards, or all of them when since is
+    None, in one transaction; readers see the old rows until it commits
+    """
+    clear = delete(daily_request_stats)
+    source = select(
+        TransportRequest.request_date,
+        TransportRequest.status,
+        TransportRequest.origin,
+        TransportRequest.destination,
+        func.count(),
+        func.count(TransportRequest.passenger_count),
+        func.sum(TransportRequest.passenger_count)
+    )
+    if since is not None:
+        # Bounded by the request_date index, so only recent rows are scanned
+        # and share-locked rather than the whole request history
+        clear = clear.where(daily_request_stats.c.stat_date >= since)
+        source = source.where(TransportRequest.request_date >= since)
+
+    async with async_engine.begin() as connection:
+        await connection.execute(clear)
+        await connection.execute(
+            insert(daily_request_stats).from_select(
+                [
+                    "stat_date", "status", "origin", "destination",
+                    "request_count", "passenger_requests", "passenger_count"
+                ],
+                source.group_by(
+                    TransportRequest.request_date,
+                    TransportRequest.status,
+                    TransportRequest.origin,
+                    TransportRequest.destination
+                )
+            )
+        )
+
+
+# Every worker runs the refresh loop; a database lock held for the pass lets
+# only one of them rebuild at a time and the rest skip until their next pass
+ROLLUP_LOCK_NAME = "hal_daily_request_stats_refresh"
+
+# Session-level lock calls per dialect: (try to acquire without waiting, release)
+ROLLUP_LOCK_STATEMENTS = {
+    "mysql": (
+        text("SELECT GET_LOCK(:name, 0)"),
+        text("SELECT RELEASE_LOCK(:name)")
+    ),
+    "postgresql": (
+        text("SELECT pg_try_advisory_lock(hashtext(:name))"),
+        text("SELECT pg_advisory_unlock(hashtext(:name))")
+    ),
+}
+
+
+async def acquire_rollup_lock(connection: AsyncConnection) -> bool:
+    """
+    Take the rebuild lock on this connection without waiting; False if another
+    worker holds it. Backends without one (SQLite in development, a single
+    process) always get it.
+    """
+    statements = ROLLUP_LOCK_STATEMENTS.get(connection.dialect.name)
+    if statements is None:
+        return True
+    acquired = (await connection.execute(statements[0], {"name": ROLLUP_LOCK_NAME})).scalar()
+    return bool(acquired)
+
+
+async def release_rollup_lock(connection: AsyncConnection) -> None:
+    """Release the rebuild lock before the connection goes back to the pool"""
+    statements = ROLLUP_LOCK_STATEMENTS.get(connection.dialect.name)
+    if statements is not None:
+        await connection.execute(statements[1], {"name": ROLLUP_LOCK_NAME})
+
+
+async def refresh_daily_request_stats_periodically() -> None:
+    """Keep the rollup current for the lifetime of the app"""
+    last_full_refresh: Optional[float] = None
+    while True:
+        try:
+            async with async_engine.connect() as connection:
+                if not await acquire_rollup_lock(connection):
+                    logger.debug("Daily request stats refresh skipped; another worker holds the lock")
+                else:
+                    try:
+                        populated = (await connection.execute(
+                            select(daily_request_stats.c.stat_date).limit(1)
+                        )).first() is not None
+                        if populated and last_full_refresh is None:
+                            # Built by an earlier run; count the full rebuild
+                            # interval from this worker's start
+                            last_full_refresh = time.monotonic()
+                        full = not populated or (
+                            time.monotonic() - last_full_refresh >= settings.DAILY_STATS_FULL_REFRESH_SECONDS
+                        )
+                        since = None if full else date.today() - timedelta(days=settings.DAILY_STATS_REFRESH_DAYS)
+                        await refresh_daily_request_stats(since)
+                        if full:
+                            last_full_refresh = time.monotonic()
+                    finally:
+                        await release_rollup_lock(connection)
+        except Exception as e:
+            # Anything escaping would end the task silently, so every failure
+            # is logged and retried on the next pass
+            logger.error(f"Failed to refresh daily request stats: {e}", exc_info=True)
+        await asyncio.sleep(settings.DAILY_STATS_REFRESH_SECONDS)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload, raiseload, selectinload
+from sqlalchemy import and_, or_, func, desc, case, exists, insert, select, true
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from typing import Optional, List
-from datetime import datetime, date, time
-from app.database import get_db
+from datetime import datetime, date, time, timedelta
+from app.database import AsyncSessionLocal, fetch_rows, get_db, get_async_db
 from app.auth import get_admin_user, get_current_active_user
 from app.models.user import User
 from app.models.transport_request import TransportRequest, RequestStatus, Priority
@@ -11,104 +14,153 @@ from app.models.vehicle_assignment import VehicleAssignment, AssignmentStatus
 from app.models.vehicle import Vehicle
 from app.models.driver import Driver
 from app.schemas.transport_request import RequestApproval, RequestRejection
-from app.auth import get_password_hash
+from app.auth import get_password_hash_async, invalidate_user_cache, invalidate_user_cache_by_id
+from app.cache import (
+    cache_key, cache_get, cache_set, DASHBOARD_CACHE_KEY, DASHBOARD_FRESH_CACHE_KEY,
+    RESOURCE_AVAILABILITY_CACHE_KEY,
+    available_resources_cache_key, invalidate_dashboard_cache
+)
 from app.models.user import UserRole
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
+import asyncio
+import hashlib
 import logging
+import orjson
+import secrets
+import string
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-
-@router.get("/dashboard")
-async def get_dashboard_stats(
-    admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
+# Dashboard counters are aggregate and not user-specific, so one cached copy
+# is shared by all admins for a few seconds. Past that the copy is kept a while
+# longer to stand in when the database is slow or down.
+DASHBOARD_CACHE_TTL = 30
+DASHBOARD_STALE_TTL = 300
+DASHBOARD_QUERY_TIMEOUT = 1.5  # Seconds to wait for fresh counters while a stale copy exists
+DASHBOARD_TRENDS_CACHE_TTL = 600  # Last-7-days series and popular routes
+RESOURCE_AVAILABILITY_CACHE_TTL = 10
+AVAILABLE_RESOURCES_CACHE_TTL = 15
+# Lets polling browsers reuse the last counters briefly before revalidating
+DASHBOARD_CACHE_CONTROL = "private, max-age=10"
+
+# Status sets for membership checks, built once instead of per call
+ACTIVE_ASSIGNMENT_STATUSES = (AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS)
+CANCELLABLE_STATUSES = frozenset({RequestStatus.PENDING, RequestStatus.APPROVED})
+FINISHED_STATUSES = frozenset({RequestStatus.COMPLETED, RequestStatus.CANCELLED})
+BULK_SUCCESS_STATUSES = frozenset({"approved", "rejected", "cancelled"})
+
+# Bulk user creation is capped and hashes only a few passwords at a time, so
+# one large request can't hold up logins waiting on the shared bcrypt pool
+MAX_BULK_USERS = 100
+BULK_HASH_CONCURRENCY = 2
+
+
+def etag_response(request: Request, payload: dict) -> Response:
     """
-    Get dashboard statistics for admin
+    Serve payload with an ETag, or an empty 304 when the client already holds
+    the same body, so unchanged polls don't re-send the JSON
     """
-    today = date.today()
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
 
-    # Basic counts
-    total_requests_today = db.query(TransportRequest).filter(
-        func.date(TransportRequest.created_at) == today
-    ).count()
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    pending_requests = db.query(TransportRequest).filter(
-        TransportRequest.status == RequestStatus.PENDING
-    ).count()
+    return Response(content=body, media_type="application/json", headers=headers)
 
-    approved_requests_today = db.query(TransportRequest).filter(
-        and_(
-            func.date(TransportRequest.created_at) == today,
-            TransportRequest.status == RequestStatus.APPROVED
-        )
-    ).count()
 
-    completed_trips_today = db.query(VehicleAssignment).filter(
-        and_(
-            func.date(VehicleAssignment.assignment_date) == today,
-            VehicleAssignment.status == AssignmentStatus.COMPLETED
-        )
-    ).count()
+def has_active_assignment(assignment_column, resource_id, *criteria):
+    """
+    Correlated EXISTS for a vehicle/driver being on an assigned or in-progress trip.
+    Negate it for an anti-join, which plans better than NOT IN (subquery).
+    """
+    return exists().where(
+        assignment_column == resource_id,
+        VehicleAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
+        *criteria
+    )
 
-    active_vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).count()
-    available_drivers = db.query(Driver).filter(
-        and_(Driver.is_active == True, Driver.is_available == True)
-    ).count()
 
-    # Real-time resource availability counts
-    # Available vehicles: active vehicles not currently assigned to active trips
-    assigned_vehicle_ids = db.query(VehicleAssignment.vehicle_id).filter(
-        VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-    ).subquery()
+def encode_request_cursor(request: TransportRequest) -> str:
+    """Keyset cursor for the admin request list, ordered by (created_at, id) descending"""
+    return f"{request.created_at.isoformat()}|{request.id}"
 
-    available_vehicles = db.query(Vehicle).filter(
-        and_(
-            Vehicle.is_active == True,
-            ~Vehicle.id.in_(assigned_vehicle_ids)
+
+def decode_request_cursor(cursor: str):
+    try:
+        created_at, request_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(request_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
         )
-    ).count()
 
-    # Available drivers: active and available drivers not currently assigned to active trips
-    assigned_driver_ids = db.query(VehicleAssignment.driver_id).filter(
-        VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-    ).subquery()
 
-    available_drivers_real = db.query(Driver).filter(
-        and_(
-            Driver.is_active == True,
-            Driver.is_available == True,
-            ~Driver.id.in_(assigned_driver_ids)
-        )
-    ).count()
+def overlaps_assignment_window(departure, arrival):
+    """
+    Whether an assignment's estimated window intersects [departure, arrival).
+    Half-open intervals overlap iff each starts before the other ends, which
+    also catches an existing trip that fully contains the new one while
+    letting a trip start exactly when the previous one arrives.
+    """
+    return and_(
+        VehicleAssignment.estimated_departure < arrival,
+        VehicleAssignment.estimated_arrival > departure
+    )
+
+
+async def get_dashboard_trends(today: date) -> dict:
+    """
+    Last-7-days request counts and popular routes for the dashboard.
+    These scan a week of requests but barely move between loads, so they're
+    cached far longer than the live counters.
+    """
+    trends_cache_key = cache_key("admin", "dashboard-trends", today.isoformat())
+    trends = await cache_get(trends_cache_key)
+    if trends is not None:
+        return trends
 
     # Recent requests (last 7 days)
-    from datetime import timedelta
     week_ago = today - timedelta(days=7)
 
-    daily_requests = []
-    for i in range(7):
-        day = week_ago + timedelta(days=i)
-        count = db.query(TransportRequest).filter(
-            func.date(TransportRequest.created_at) == day
-        ).count()
-        daily_requests.append(count)
+    # One grouped query for the 7 days before today instead of a COUNT per day.
+    # func.date() yields a string on SQLite and a date elsewhere, so key by ISO text.
+    request_day = func.date(TransportRequest.created_at).label('day')
+    daily_query = select(
+        request_day,
+        func.count(TransportRequest.id).label('count')
+    ).where(
+        TransportRequest.created_at >= datetime.combine(week_ago, time.min),
+        TransportRequest.created_at < datetime.combine(today, time.min)
+    ).group_by(request_day)
 
     # Popular routes
-    popular_routes = db.query(
+    popular_routes_query = select(
         TransportRequest.origin,
         TransportRequest.destination,
         func.count(TransportRequest.id).label('count')
-    ).filter(
+    ).where(
         TransportRequest.created_at >= week_ago
     ).group_by(
         TransportRequest.origin, TransportRequest.destination
-    ).order_by(desc('count')).limit(5).all()
+    ).order_by(desc('count')).limit(5)
+
+    daily_rows, popular_routes = await asyncio.gather(
+        fetch_rows(daily_query), fetch_rows(popular_routes_query)
+    )
+
+    counts_by_day = {str(row.day): row.count for row in daily_rows}
+    daily_requests = [
+        counts_by_day.get((week_ago + timedelta(days=i)).isoformat(), 0)
+        for i in range(7)
+    ]
 
     routes_data = []
     total_route_requests = sum([route.count for route in popular_routes])
@@ -121,7 +173,83 @@ async def get_dashboard_stats(
             "percentage": round(percentage, 1)
         })
 
-    return {
+    trends = {
+        "requests_last_7_days": daily_requests,
+        "popular_routes": routes_data
+    }
+    await cache_set(trends_cache_key, trends, DASHBOARD_TRENDS_CACHE_TTL)
+    return trends
+
+
+async def compute_dashboard_stats(db: AsyncSession) -> dict:
+    """Live counters plus the cached weekly trends for the admin dashboard"""
+    today = date.today()
+
+    # Available vehicles/drivers: active ones not currently assigned to active trips
+    vehicle_on_trip = has_active_assignment(VehicleAssignment.vehicle_id, Vehicle.id)
+    driver_on_trip = has_active_assignment(VehicleAssignment.driver_id, Driver.id)
+    # Range rather than DATE(created_at) so the created_at index applies
+    created_today = and_(
+        TransportRequest.created_at >= datetime.combine(today, time.min),
+        TransportRequest.created_at < datetime.combine(today + timedelta(days=1), time.min)
+    )
+
+    # One conditional-aggregation row per table, cross-joined so every
+    # counter comes back in a single round trip
+    request_counts = select(
+        func.count(case((created_today, 1))).label('total_requests_today'),
+        func.count(case((TransportRequest.status == RequestStatus.PENDING, 1))).label('pending_requests'),
+        func.count(case((
+            and_(created_today, TransportRequest.status == RequestStatus.APPROVED), 1
+        ))).label('approved_requests_today')
+    ).subquery()
+
+    assignment_counts = select(
+        func.count().label('completed_trips_today')
+    ).where(
+        and_(
+            VehicleAssignment.assignment_date == today,
+            VehicleAssignment.status == AssignmentStatus.COMPLETED
+        )
+    ).subquery()
+
+    vehicle_counts = select(
+        func.count().label('active_vehicles'),
+        func.count(case((~vehicle_on_trip, 1))).label('available_vehicles')
+    ).where(Vehicle.is_active == True).subquery()
+
+    driver_counts = select(
+        func.count().label('available_drivers'),
+        func.count(case((~driver_on_trip, 1))).label('available_drivers_real')
+    ).where(
+        and_(Driver.is_active == True, Driver.is_available == True)
+    ).subquery()
+
+    # The counters and the weekly trends are independent, so they run concurrently
+    counts_result, trends = await asyncio.gather(
+        db.execute(
+            select(
+                request_counts, assignment_counts, vehicle_counts, driver_counts
+            ).select_from(
+                request_counts.join(assignment_counts, true())
+                .join(vehicle_counts, true())
+                .join(driver_counts, true())
+            )
+        ),
+        get_dashboard_trends(today)
+    )
+    counts = counts_result.one()
+
+    total_requests_today = counts.total_requests_today
+    pending_requests = counts.pending_requests
+    approved_requests_today = counts.approved_requests_today
+    completed_trips_today = counts.completed_trips_today
+    active_vehicles = counts.active_vehicles
+    available_drivers = counts.available_drivers
+    available_vehicles = counts.available_vehicles
+    available_drivers_real = counts.available_drivers_real
+
+    stats = {
         "total_requests_today": total_requests_today,
         "pending_requests": pending_requests,
         "approved_requests_today": approved_requests_today,
@@ -141,55 +269,137 @@ async def get_dashboard_stats(
             "available_vehicles": available_vehicles,
             "pending_requests": pending_requests
         },
-        "trends": {
-            "requests_last_7_days": daily_requests,
-            "popular_routes": routes_data
-        }
+        "trends": trends
     }
 
+    return stats
+
+
+async def refresh_dashboard_stats() -> dict:
+    """
+    Recompute the dashboard stats on a session of their own and cache them.
+    A caller that gives up waiting leaves the queries to finish instead of
+    cancelling them on a connection that then goes back to the pool.
+    """
+    async with AsyncSessionLocal() as session:
+        stats = await compute_dashboard_stats(session)
+    await cache_set(DASHBOARD_CACHE_KEY, stats, DASHBOARD_STALE_TTL)
+    await cache_set(DASHBOARD_FRESH_CACHE_KEY, True, DASHBOARD_CACHE_TTL)
+    return stats
+
+
+# The dashboard refresh in flight in this process, if any. Requests that find
+# the stats stale wait on it instead of each starting their own, so a slow
+# database sees one set of dashboard queries per worker however many admins
+# are polling.
+_dashboard_refresh: Optional[asyncio.Task] = None
+
+
+def _log_failed_refresh(task: asyncio.Task) -> None:
+    # Retrieved here because the requests waiting on a refresh may all have
+    # timed out and moved on before it fails
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Dashboard refresh failed: {task.exception()!r}")
+
+
+def start_dashboard_refresh() -> asyncio.Task:
+    """Return the in-flight dashboard refresh, starting one if none is running"""
+    global _dashboard_refresh
+    if _dashboard_refresh is None or _dashboard_refresh.done():
+        _dashboard_refresh = asyncio.ensure_future(refresh_dashboard_stats())
+        _dashboard_refresh.add_done_callback(_log_failed_refresh)
+    return _dashboard_refresh
+
+
+@router.get("/dashboard")
+async def get_dashboard_stats(
+    request: Request,
+    admin_user: User = Depends(get_admin_user)
+):
+    """
+    Get dashboard statistics for admin
+    """
+    fresh, cached = await asyncio.gather(
+        cache_get(DASHBOARD_FRESH_CACHE_KEY),
+        cache_get(DASHBOARD_CACHE_KEY)
+    )
+    if fresh is not None and cached is not None:
+        return etag_response(request, cached)
+
+    # Shielded so a request that stops waiting never cancels the shared refresh
+    refresh = asyncio.shield(start_dashboard_refresh())
+    try:
+        if cached is None:
+            stats = await refresh
+        else:
+            # Stale-while-error: a slow or failing query falls back to the last
+            # copy. The refresh keeps running past the timeout and updates the
+            # cache when it completes.
+            stats = await asyncio.wait_for(refresh, DASHBOARD_QUERY_TIMEOUT)
+    except (asyncio.TimeoutError, SQLAlchemyError, OSError) as e:
+        if cached is not None:
+            logger.warning(f"Serving stale dashboard stats: {e!r}")
+            return etag_response(request, cached)
+        logger.error(f"Dashboard stats unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Dashboard statistics are temporarily unavailable"
+        )
+
+    return etag_response(request, stats)
+
 
 @router.get("/resource-availability")
 async def get_resource_availability(
+    request: Request,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get real-time resource availability counts for dashboard counters
     """
-    # Available drivers: active and available drivers not currently assigned to active trips
-    assigned_driver_ids = db.query(VehicleAssignment.driver_id).filter(
-        VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-    ).subquery()
+    cached_availability = await cache_get(RESOURCE_AVAILABILITY_CACHE_KEY)
+    if cached_availability is not None:
+        return etag_response(request, cached_availability)
 
-    available_drivers = db.query(Driver).filter(
-        and_(
-            Driver.is_active == True,
-            Driver.is_available == True,
-            ~Driver.id.in_(assigned_driver_ids)
-        )
-    ).count()
+    vehicle_on_trip = has_active_assignment(VehicleAssignment.vehicle_id, Vehicle.id)
+    driver_on_trip = has_active_assignment(VehicleAssignment.driver_id, Driver.id)
+
+    # Available drivers: active and available drivers not currently assigned to active trips
+    driver_counts = select(
+        func.count().label('total_drivers'),
+        func.count(case((
+            and_(Driver.is_available == True, ~driver_on_trip), 1
+        ))).label('available_drivers')
+    ).where(Driver.is_active == True).subquery()
 
     # Available vehicles: active vehicles not currently assigned to active trips
-    assigned_vehicle_ids = db.query(VehicleAssignment.vehicle_id).filter(
-        VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-    ).subquery()
+    vehicle_counts = select(
+        func.count().label('total_vehicles'),
+        func.count(case((~vehicle_on_trip, 1))).label('available_vehicles')
+    ).where(Vehicle.is_active == True).subquery()
 
-    available_vehicles = db.query(Vehicle).filter(
-        and_(
-            Vehicle.is_active == True,
-            ~Vehicle.id.in_(assigned_vehicle_ids)
+    # Pending requests: transport requests awaiting assignment
+    request_counts = select(
+        func.count().label('pending_requests')
+    ).where(TransportRequest.status == RequestStatus.PENDING).subquery()
+
+    # All counters in a single round trip
+    counts = (await db.execute(
+        select(
+            driver_counts, vehicle_counts, request_counts
+        ).select_from(
+            driver_counts.join(vehicle_counts, true()).join(request_counts, true())
         )
-    ).count()
+    )).one()
 
-    # Pending requests: transport requests awaiting assignment
-    pending_requests = db.query(TransportRequest).filter(
-        TransportRequest.status == RequestStatus.PENDING
-    ).count()
+    available_drivers = counts.available_drivers
+    available_vehicles = counts.available_vehicles
+    pending_requests = counts.pending_requests
+    total_drivers = counts.total_drivers
+    total_vehicles = counts.total_vehicles
 
     # Calculate availability status for color coding
-    total_drivers = db.query(Driver).filter(Driver.is_active == True).count()
-    total_vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).count()
-
     driver_availability_percentage = (available_drivers / total_drivers * 100) if total_drivers > 0 else 0
     vehicle_availability_percentage = (available_vehicles / total_vehicles * 100) if total_vehicles > 0 else 0
 
@@ -202,7 +412,7 @@ async def get_resource_availability(
         else:
             return "critical"  # Red
 
-    return {
+    availability = {
         "available_drivers": available_drivers,
         "available_vehicles": available_vehicles,
         "pending_requests": pending_requests,
@@ -215,6 +425,9 @@ async def get_resource_availability(
         "pending_status": "critical" if pending_requests > 10 else "warning" if pending_requests > 5 else "good"
     }
 
+    await cache_set(RESOURCE_AVAILABILITY_CACHE_KEY, availability, RESOURCE_AVAILABILITY_CACHE_TTL)
+    return etag_response(request, availability)
+
 
 @router.get("/requests")
 async def get_all_requests(
@@ -225,11 +438,15 @@ async def get_all_requests(
     date_to: Optional[date] = None,
     department: Optional[str] = None,
     priority: Optional[Priority] = None,
+    cursor: Optional[str] = None,
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all transport requests for admin review
+
+    Pass the previous response's next_cursor as cursor to page by keyset
+    instead of OFFSET; cursor pages skip the total count.
     """
     query = db.query(TransportRequest).join(User, TransportRequest.user_id == User.id)
 
@@ -241,17 +458,61 @@ async def get_all_requests(
     if date_to:
         query = query.filter(TransportRequest.request_date <= date_to)
     if department:
-        query = query.filter(User.department.ilike(f"%{department}%"))
+        # Exact match so ix_users_department applies; a leading-wildcard
+        # ILIKE scanned every user (MySQL's default collation still makes
+        # this case-insensitive)
+        query = query.filter(User.department == department)
     if priority:
         query = query.filter(TransportRequest.priority == priority)
 
-    # Get total count
-    total = query.count()
+    # Filtered query without loader options, for the fallback count below
+    count_query = query
 
-    # Apply pagination and ordering
-    requests = query.order_by(
-        TransportRequest.created_at.desc()
-    ).offset((page - 1) * limit).limit(limit).all()
+    if cursor:
+        # Seek straight past the last row seen; cost doesn't grow with depth
+        cursor_created_at, cursor_id = decode_request_cursor(cursor)
+        offset = None
+        query = query.filter(
+            or_(
+                TransportRequest.created_at < cursor_created_at,
+                and_(TransportRequest.created_at == cursor_created_at, TransportRequest.id < cursor_id)
+            )
+        )
+    else:
+        # The total rides along on every row as COUNT(*) OVER () instead of
+        # a separate COUNT query over the same filtered join
+        offset = (page - 1) * limit
+        query = query.add_columns(func.count().over().label('total'))
+
+    # Apply pagination and ordering. Everything the response touches is
+    # loaded up front (the requester via the existing join) and any other
+    # relationship access raises instead of issuing a query per row.
+    rows = query.options(
+        contains_eager(TransportRequest.user).load_only(
+            User.id, User.first_name, User.last_name, User.employee_id, User.department, User.phone
+        ),
+        joinedload(TransportRequest.approver).load_only(
+            User.id, User.first_name, User.last_name, User.employee_id
+        ),
+        selectinload(TransportRequest.vehicle_assignment).joinedload(VehicleAssignment.vehicle),
+        selectinload(TransportRequest.vehicle_assignment).joinedload(VehicleAssignment.driver),
+        raiseload('*')
+    ).order_by(
+        TransportRequest.created_at.desc(), TransportRequest.id.desc()
+    ).offset(offset).limit(limit).all()
+
+    if cursor:
+        requests = rows
+        total = None
+    else:
+        requests = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # Paged past the end, so no row carried the total
+            total = count_query.with_entities(func.count(TransportRequest.id)).scalar()
+        else:
+            total = 0
 
     # Format response
     request_responses = []
@@ -273,11 +534,8 @@ async def get_all_requests(
             }
 
         # Get vehicle assignment if exists
-        assignment = db.query(VehicleAssignment).filter(
-            VehicleAssignment.request_id == request.id
-        ).first()
-
-        if assignment:
+        if request.vehicle_assignment:
+            assignment = request.vehicle_assignment[0]
             request_dict['vehicle_assignment'] = {
                 **assignment.to_dict(),
                 'vehicle': assignment.vehicle.to_dict(),
@@ -286,15 +544,24 @@ async def get_all_requests(
 
         request_responses.append(request_dict)
 
-    return {
-        "requests": request_responses,
-        "pagination": {
+    next_cursor = encode_request_cursor(requests[-1]) if len(requests) == limit else None
+    if cursor:
+        pagination = {"limit": limit, "cursor": cursor, "next_cursor": next_cursor}
+    else:
+        pagination = {
             "page": page,
             "limit": limit,
             "total": total,
-            "pages": (total + limit - 1) // limit
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
-    }
+
+    # Already plain JSON data, so hand it straight to orjson rather than
+    # walking every row again through jsonable_encoder
+    return ORJSONResponse({
+        "requests": request_responses,
+        "pagination": pagination
+    })
 
 
 @router.put("/requests/{request_id}/approve-with-assignment")
@@ -345,26 +612,24 @@ async def approve_request_with_assignment(
             detail="Driver not found or unavailable"
         )
 
-    # Check for conflicts (same vehicle/driver at same time)
-    conflict_check = db.query(VehicleAssignment).join(TransportRequest).filter(
+    # Check for conflicts (same vehicle/driver at same time). Assignments are
+    # dated with their request's date, so (vehicle_id|driver_id, assignment_date)
+    # index probes find the candidates without joining transport_requests.
+    conflict_check = db.query(
+        VehicleAssignment.vehicle_id,
+        VehicleAssignment.driver_id,
+        VehicleAssignment.estimated_departure,
+        VehicleAssignment.estimated_arrival
+    ).filter(
         and_(
             or_(
                 VehicleAssignment.vehicle_id == approval_data.vehicle_id,
                 VehicleAssignment.driver_id == approval_data.driver_id
             ),
-            TransportRequest.request_date == request.request_date,
-            VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS]),
+            VehicleAssignment.assignment_date == request.request_date,
+            VehicleAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES),
             # Check time overlap
-            or_(
-                and_(
-                    VehicleAssignment.estimated_departure <= approval_data.estimated_departure,
-                    VehicleAssignment.estimated_arrival >= approval_data.estimated_departure
-                ),
-                and_(
-                    VehicleAssignment.estimated_departure <= approval_data.estimated_arrival,
-                    VehicleAssignment.estimated_arrival >= approval_data.estimated_arrival
-                )
-            )
+            overlaps_assignment_window(approval_data.estimated_departure, approval_data.estimated_arrival)
         )
     ).first()
 
@@ -423,12 +688,13 @@ async def approve_request_with_assignment(
     )
 
     # Update driver availability to false when assigned
-    assigned_driver = db.query(Driver).filter(Driver.id == approval_data.driver_id).first()
-    if assigned_driver:
-        assigned_driver.is_available = False
+    driver.is_available = False
 
     db.add(assignment)
+    # Read before commit expires the row
+    request_date = request.request_date
     db.commit()
+    await invalidate_dashboard_cache(request_date)
     db.refresh(assignment)
 
     logger.info(f"Admin {admin_user.employee_id} approved request {request_id}")
@@ -469,6 +735,7 @@ async def reject_request_with_reason(
     request.rejection_reason = rejection_data.rejection_reason
 
     db.commit()
+    await invalidate_dashboard_cache()
 
     logger.info(f"Admin {admin_user.employee_id} rejected request {request_id}")
 
@@ -502,6 +769,7 @@ async def approve_request_unified(
     request.approved_at = datetime.utcnow()
 
     db.commit()
+    await invalidate_dashboard_cache()
     logger.info(f"Admin {admin_user.employee_id} approved request {request_id}")
 
     return {"message": "Request approved successfully", "status": "approved"}
@@ -535,6 +803,7 @@ async def reject_request_unified(
     request.rejection_reason = "Rejected by admin"
 
     db.commit()
+    await invalidate_dashboard_cache()
     logger.info(f"Admin {admin_user.employee_id} rejected request {request_id}")
 
     return {"message": "Request rejected successfully", "status": "rejected"}
@@ -556,7 +825,7 @@ async def cancel_request_unified(
             detail="Request not found"
         )
 
-    if request.status in [RequestStatus.COMPLETED, RequestStatus.CANCELLED]:
+    if request.status in FINISHED_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot cancel completed or already cancelled request"
@@ -565,14 +834,19 @@ async def cancel_request_unified(
     request.status = RequestStatus.CANCELLED
 
     # Cancel vehicle assignment if exists and restore driver availability
-    assignment = db.query(VehicleAssignment).filter(VehicleAssignment.request_id == request_id).first()
+    assignment = db.query(VehicleAssignment).options(
+        joinedload(VehicleAssignment.driver)
+    ).filter(VehicleAssignment.request_id == request_id).first()
     if assignment:
         assignment.status = AssignmentStatus.CANCELLED
         # Restore driver availability when assignment is cancelled
         if assignment.driver:
             assignment.driver.is_available = True
 
+    # Read before commit expires the row
+    request_date = request.request_date
     db.commit()
+    await invalidate_dashboard_cache(request_date)
     logger.info(f"Admin {admin_user.employee_id} cancelled request {request_id}")
 
     return {"message": "Request cancelled successfully", "status": "cancelled"}
@@ -587,7 +861,13 @@ async def get_request_details(
     """
     Get detailed information about a specific transport request
     """
-    request = db.query(TransportRequest).filter(TransportRequest.id == request_id).first()
+    # Requester, approver and assignment with its vehicle/driver in one statement
+    request = db.query(TransportRequest).options(
+        joinedload(TransportRequest.user),
+        joinedload(TransportRequest.approver),
+        joinedload(TransportRequest.vehicle_assignment).joinedload(VehicleAssignment.vehicle),
+        joinedload(TransportRequest.vehicle_assignment).joinedload(VehicleAssignment.driver)
+    ).filter(TransportRequest.id == request_id).first()
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -615,11 +895,8 @@ async def get_request_details(
         }
 
     # Get vehicle assignment if exists
-    assignment = db.query(VehicleAssignment).filter(
-        VehicleAssignment.request_id == request.id
-    ).first()
-
-    if assignment:
+    if request.vehicle_assignment:
+        assignment = request.vehicle_assignment[0]
         request_dict['assignment'] = {
             "id": assignment.id,
             "vehicle": {
@@ -644,72 +921,84 @@ async def get_request_details(
     return request_dict
 
 
-@router.get("/requests/{request_id}/available-resources")
-async def get_available_resources(
-    request_id: int,
-    admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get available vehicles and drivers for a specific request
-    """
+async def compute_available_resources(request_id: int, db: AsyncSession) -> dict:
+    """Free vehicles and drivers for a request, shared by the resource endpoints"""
     # Get the request
-    request = db.query(TransportRequest).filter(TransportRequest.id == request_id).first()
+    request = (await db.execute(
+        select(TransportRequest.request_date, TransportRequest.request_time).where(
+            TransportRequest.id == request_id
+        )
+    )).one_or_none()
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Request not found"
         )
 
-    # Get all active vehicles
-    all_vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).all()
-
-    # Get all active and available drivers
-    all_drivers = db.query(Driver).filter(
-        and_(Driver.is_active == True, Driver.is_available == True)
-    ).all()
-
-    # Check which vehicles and drivers are available for this request's time slot
-    available_vehicles = []
-    available_drivers = []
-
-    for vehicle in all_vehicles:
-        # Check if vehicle is busy at request time
-        conflict = db.query(VehicleAssignment).join(TransportRequest).filter(
-            and_(
-                VehicleAssignment.vehicle_id == vehicle.id,
-                TransportRequest.request_date == request.request_date,
-                VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
+    resources_cache_key = available_resources_cache_key(request.request_date)
+    resources = await cache_get(resources_cache_key)
+    if resources is None:
+        # Vehicles and drivers already on an active trip on the request's date
+        on_request_date = (
+            VehicleAssignment.request_id == TransportRequest.id,
+            TransportRequest.request_date == request.request_date
+        )
+        vehicle_busy = has_active_assignment(VehicleAssignment.vehicle_id, Vehicle.id, *on_request_date)
+        driver_busy = has_active_assignment(VehicleAssignment.driver_id, Driver.id, *on_request_date)
+
+        # Active vehicles that are free for this request's time slot
+        free_vehicles = (await db.execute(
+            select(
+                Vehicle.id, Vehicle.vehicle_number, Vehicle.vehicle_type, Vehicle.capacity, Vehicle.fuel_type
+            ).where(
+                and_(Vehicle.is_active == True, ~vehicle_busy)
             )
-        ).first()
-
-        if not conflict:
-            available_vehicles.append({
-                "id": vehicle.id,
-                "vehicle_number": vehicle.vehicle_number,
-                "vehicle_type": vehicle.vehicle_type.value,
-                "capacity": vehicle.capacity,
-                "fuel_type": vehicle.fuel_type.value
-            })
-
-    for driver in all_drivers:
-        # Check if driver is busy at request time
-        conflict = db.query(VehicleAssignment).join(TransportRequest).filter(
-            and_(
-                VehicleAssignment.driver_id == driver.id,
-                TransportRequest.request_date == request.request_date,
-                VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
+        )).all()
+
+        # Active and available drivers that are free for this request's time
+        # slot, with the display name built by the database (|| or CONCAT)
+        free_drivers = (await db.execute(
+            select(
+                Driver.id,
+                Driver.employee_id,
+                (Driver.first_name + " " + Driver.last_name).label("name"),
+                Driver.license_number,
+                Driver.phone
+            ).where(
+                and_(
+                    Driver.is_active == True,
+                    Driver.is_available == True,
+                    ~driver_busy
+                )
             )
-        ).first()
+        )).all()
+
+        resources = {
+            "available_vehicles": [
+                {
+                    "id": vehicle.id,
+                    "vehicle_number": vehicle.vehicle_number,
+                    "vehicle_type": vehicle.vehicle_type.value,
+                    "capacity": vehicle.capacity,
+                    "fuel_type": vehicle.fuel_type.value
+                }
+                for vehicle in free_vehicles
+            ],
+            "available_drivers": [
+                {
+                    "id": driver.id,
+                    "employee_id": driver.employee_id,
+                    "name": driver.name,
+                    "license_number": driver.license_number,
+                    "phone": driver.phone
+                }
+                for driver in free_drivers
+            ]
+        }
+        await cache_set(resources_cache_key, resources, AVAILABLE_RESOURCES_CACHE_TTL)
 
-        if not conflict:
-            available_drivers.append({
-                "id": driver.id,
-                "employee_id": driver.employee_id,
-                "name": f"{driver.first_name} {driver.last_name}",
-                "license_number": driver.license_number,
-                "phone": driver.phone
-            })
+    available_vehicles = resources["available_vehicles"]
+    available_drivers = resources["available_drivers"]
 
     return {
         "request_id": request_id,
@@ -722,20 +1011,45 @@ async def get_available_resources(
     }
 
 
+@router.get("/requests/{request_id}/available-resources")
+async def get_available_resources(
+    request_id: int,
+    admin_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get available vehicles and drivers for a specific request
+    """
+    return await compute_available_resources(request_id, db)
+
+
 @router.get("/requests/{request_id}/assignment-options")
 async def get_assignment_options(
     request_id: int,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get assignment options (vehicles and drivers) for a specific request
     This is an alias for available-resources to match frontend expectations
     """
-    return await get_available_resources(request_id, admin_user, db)
+    return await compute_available_resources(request_id, db)
 
 
 # User Management Schemas
+ROLE_MAPPING = {
+    "employee": UserRole.EMPLOYEE,
+    "admin": UserRole.ADMIN,
+    "super_admin": UserRole.SUPER_ADMIN,
+    "transport": UserRole.TRANSPORT
+}
+ROLE_CHOICES = ", ".join(ROLE_MAPPING)  # For the invalid-role error messages
+
+# Temporary passwords stay alphanumeric so they're easy to read out and type
+TEMPORARY_PASSWORD_ALPHABET = string.ascii_letters + string.digits
+TEMPORARY_PASSWORD_LENGTH = 12
+
+
 class UserCreate(BaseModel):
     employee_id: str
     email: EmailStr
@@ -759,6 +1073,10 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class PasswordReset(BaseModel):
+    new_password: Optional[str] = None  # Generate a temporary password when omitted
+
+
 # User Management Endpoints
 @router.post("/users/")
 async def create_user(
@@ -769,40 +1087,17 @@ async def create_user(
     """
     Create new user (Admin only)
     """
-    # Check if employee_id already exists
-    existing_user = db.query(User).filter(User.employee_id == user_data.employee_id).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Employee ID already exists"
-        )
-
-    # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already exists"
-        )
-
     # Validate and convert role
-    role_mapping = {
-        "employee": UserRole.EMPLOYEE,
-        "admin": UserRole.ADMIN,
-        "super_admin": UserRole.SUPER_ADMIN,
-        "transport": UserRole.TRANSPORT
-    }
-
-    if user_data.role not in role_mapping:
+    if user_data.role not in ROLE_MAPPING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Role must be one of: {', '.join(role_mapping.keys())}"
+            detail=f"Role must be one of: {ROLE_CHOICES}"
         )
 
-    user_role = role_mapping[user_data.role]
+    user_role = ROLE_MAPPING[user_data.role]
 
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
 
     new_user = User(
         employee_id=user_data.employee_id,
@@ -818,8 +1113,27 @@ async def create_user(
         created_at=datetime.utcnow()
     )
 
+    # employee_id and email are UNIQUE, so the insert itself is the duplicate
+    # check; which one clashed is only looked up when it fails
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        conflict = db.query(User.employee_id, User.email).filter(
+            or_(User.employee_id == user_data.employee_id, User.email == user_data.email)
+        ).first()
+        if not conflict:
+            raise
+        if conflict.employee_id == user_data.employee_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Employee ID already exists"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already exists"
+        )
     db.refresh(new_user)
 
     logger.info(f"Admin {admin_user.employee_id} created user {new_user.employee_id}")
@@ -831,17 +1145,125 @@ async def create_user(
     }
 
 
+@router.post("/users/bulk")
+async def create_users_bulk(
+    users_data: List[UserCreate],
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several users in one transaction (Admin only)
+    """
+    if not users_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No users provided"
+        )
+    if len(users_data) > MAX_BULK_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_USERS} users can be created at once"
+        )
+
+    invalid_roles = sorted({u.role for u in users_data if u.role not in ROLE_MAPPING})
+    if invalid_roles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid roles {invalid_roles}. Role must be one of: {ROLE_CHOICES}"
+        )
+
+    employee_ids = [u.employee_id for u in users_data]
+    emails = [u.email for u in users_data]
+    if len(set(employee_ids)) != len(employee_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate employee IDs in request"
+        )
+    if len(set(emails)) != len(emails):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate emails in request"
+        )
+
+    def raise_if_existing():
+        # One lookup for every clash with existing accounts
+        existing = db.query(User.employee_id, User.email).filter(
+            or_(User.employee_id.in_(employee_ids), User.email.in_(emails))
+        ).all()
+        if existing:
+            existing_ids = sorted({row.employee_id for row in existing} & set(employee_ids))
+            existing_emails = sorted({row.email for row in existing} & set(emails))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Already exists - employee IDs: {existing_ids}, emails: {existing_emails}"
+            )
+
+    raise_if_existing()
+
+    # Hash a few at a time on the bcrypt pool rather than one after another
+    hash_slots = asyncio.Semaphore(BULK_HASH_CONCURRENCY)
+
+    async def hash_password(password: str) -> str:
+        async with hash_slots:
+            return await get_password_hash_async(password)
+
+    hashed_passwords = await asyncio.gather(*(hash_password(u.password) for u in users_data))
+
+    created_at = datetime.utcnow()
+    # A single executemany INSERT, which MySQL drivers send as one multi-row
+    # statement. A concurrent request can still take an employee_id or email
+    # after the check above; the UNIQUE constraints catch that.
+    try:
+        db.execute(insert(User), [
+            {
+                "employee_id": u.employee_id,
+                "email": u.email,
+                "first_name": u.first_name,
+                "last_name": u.last_name,
+                "password_hash": hashed_password,
+                "phone": u.phone,
+                "department": u.department,
+                "designation": u.designation,
+                "role": ROLE_MAPPING[u.role],
+                "is_active": True,
+                "created_at": created_at
+            }
+            for u, hashed_password in zip(users_data, hashed_passwords)
+        ])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise_if_existing()
+        raise
+
+    # Without RETURNING the new ids aren't known, so the rows are read back
+    # with one query, in request order
+    created = {user.employee_id: user for user in db.query(User).filter(User.employee_id.in_(employee_ids))}
+    new_users = [created[employee_id] for employee_id in employee_ids]
+
+    logger.info(f"Admin {admin_user.employee_id} created {len(new_users)} users in bulk")
+
+    return {
+        "message": f"{len(new_users)} users created successfully",
+        "users": [new_user.to_dict() for new_user in new_users]
+    }
+
+
 @router.get("/users/")
 async def get_all_users(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
+    cursor: Optional[int] = Query(None, ge=0),
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all users (Admin only)
+
+    Pass the previous response's next_cursor as cursor to page by keyset
+    instead of OFFSET; cursor pages skip the total count.
     """
     query = db.query(User)
 
@@ -851,21 +1273,34 @@ async def get_all_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
 
-    # Get total count
-    total = query.count()
+    if cursor is not None:
+        # Seek past the last id seen; cost doesn't grow with depth
+        query = query.filter(User.id > cursor)
+        offset = None
+    else:
+        # Get total count
+        total = query.with_entities(func.count(User.id)).scalar()
 
-    # Apply pagination
-    offset = (page - 1) * limit
-    users = query.offset(offset).limit(limit).all()
+        # Apply pagination
+        offset = (page - 1) * limit
 
-    return {
-        "users": [user.to_dict() for user in users],
-        "pagination": {
+    users = query.order_by(User.id).offset(offset).limit(limit).all()
+
+    next_cursor = users[-1].id if len(users) == limit else None
+    if cursor is not None:
+        pagination = {"limit": limit, "cursor": cursor, "next_cursor": next_cursor}
+    else:
+        pagination = {
             "page": page,
             "limit": limit,
             "total": total,
-            "pages": (total + limit - 1) // limit
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
+
+    return {
+        "users": [user.to_dict() for user in users],
+        "pagination": pagination
     }
 
 
@@ -878,7 +1313,7 @@ async def get_user(
     """
     Get specific user (Admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -898,7 +1333,7 @@ async def update_user(
     """
     Update user (Admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -910,22 +1345,17 @@ async def update_user(
 
     for field, value in update_data.items():
         if field == "role":
-            role_mapping = {
-                "employee": UserRole.EMPLOYEE,
-                "admin": UserRole.ADMIN,
-                "super_admin": UserRole.SUPER_ADMIN,
-                "transport": UserRole.TRANSPORT
-            }
-            if value not in role_mapping:
+            if value not in ROLE_MAPPING:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Role must be one of: {', '.join(role_mapping.keys())}"
+                    detail=f"Role must be one of: {ROLE_CHOICES}"
                 )
-            setattr(user, field, role_mapping[value])
+            setattr(user, field, ROLE_MAPPING[value])
         else:
             setattr(user, field, value)
 
     db.commit()
+    invalidate_user_cache(user.employee_id)
     db.refresh(user)
 
     logger.info(f"Admin {admin_user.employee_id} updated user {user.employee_id}")
@@ -945,23 +1375,24 @@ async def delete_user(
     """
     Delete user (Admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Prevent admin from deleting themselves, without loading the row
+    if user_id == admin_user.id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
         )
 
-    # Prevent admin from deleting themselves
-    if user.id == admin_user.id:
+    user = db.get(User, user_id)
+    if not user:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete your own account"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
 
     # Soft delete by setting is_active to False
     user.is_active = False
     db.commit()
+    invalidate_user_cache(user.employee_id)
 
     logger.info(f"Admin {admin_user.employee_id} deleted user {user.employee_id}")
 
@@ -994,6 +1425,7 @@ async def delete_user_by_employee_id(
     # Soft delete by setting is_active to False
     user.is_active = False
     db.commit()
+    invalidate_user_cache(user.employee_id)
 
     logger.info(f"Admin {admin_user.employee_id} deleted user {user.employee_id}")
 
@@ -1003,26 +1435,43 @@ async def delete_user_by_employee_id(
 @router.post("/users/{user_id}/reset-password")
 async def reset_user_password(
     user_id: int,
-    new_password: str,
+    reset_data: Optional[PasswordReset] = None,
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Reset user password (Admin only)
+
+    Sets new_password when one is given, otherwise generates and returns a
+    temporary password
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
+    new_password = reset_data.new_password if reset_data else None
+    temporary_password = None
+    if not new_password:
+        # Generate new temporary password
+        new_password = temporary_password = ''.join(
+            secrets.choice(TEMPORARY_PASSWORD_ALPHABET) for _ in range(TEMPORARY_PASSWORD_LENGTH)
+        )
+
     # Update password
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = await get_password_hash_async(new_password)
     db.commit()
+    invalidate_user_cache(user.employee_id)
 
     logger.info(f"Admin {admin_user.employee_id} reset password for user {user.employee_id}")
 
+    if temporary_password:
+        return {
+            "message": "Password reset successfully",
+            "temporary_password": temporary_password
+        }
     return {"message": "Password reset successfully"}
 
 
@@ -1035,25 +1484,26 @@ async def deactivate_user(
     """
     Deactivate user (Admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # Prevent admin from deactivating themselves
-    if user.id == admin_user.id:
+    # Prevent admin from deactivating themselves, without loading the row
+    if user_id == admin_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot deactivate your own account"
         )
 
-    # Deactivate user
-    user.is_active = False
+    # Deactivate user with a single UPDATE; no matched row means no such user
+    updated = db.query(User).filter(User.id == user_id).update(
+        {User.is_active: False}, synchronize_session=False
+    )
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     db.commit()
+    invalidate_user_cache_by_id(user_id)
 
-    logger.info(f"Admin {admin_user.employee_id} deactivated user {user.employee_id}")
+    logger.info(f"Admin {admin_user.employee_id} deactivated user id {user_id}")
 
     return {"message": "User deactivated successfully"}
 
@@ -1067,18 +1517,19 @@ async def activate_user(
     """
     Activate user (Admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Activate user with a single UPDATE; no matched row means no such user
+    updated = db.query(User).filter(User.id == user_id).update(
+        {User.is_active: True}, synchronize_session=False
+    )
+    if not updated:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-
-    # Activate user
-    user.is_active = True
     db.commit()
+    invalidate_user_cache_by_id(user_id)
 
-    logger.info(f"Admin {admin_user.employee_id} activated user {user.employee_id}")
+    logger.info(f"Admin {admin_user.employee_id} activated user id {user_id}")
 
     return {"message": "User activated successfully"}
 
@@ -1092,7 +1543,8 @@ async def toggle_user_status(
     """
     Toggle user status (Admin only)
     """
-    user = db.query(User).filter(User.employee_id == employee_id).first()
+    # Only the two columns the toggle reads, not a hydrated User
+    user = db.query(User.id, User.is_active).filter(User.employee_id == employee_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1107,48 +1559,19 @@ async def toggle_user_status(
         )
 
     # Toggle status
-    user.is_active = not user.is_active
+    is_active = not user.is_active
+    db.query(User).filter(User.id == user.id).update(
+        {User.is_active: is_active}, synchronize_session=False
+    )
     db.commit()
+    invalidate_user_cache(employee_id)
 
-    action = "activated" if user.is_active else "deactivated"
-    logger.info(f"Admin {admin_user.employee_id} {action} user {user.employee_id}")
+    action = "activated" if is_active else "deactivated"
+    logger.info(f"Admin {admin_user.employee_id} {action} user {employee_id}")
 
     return {
         "message": f"User {action} successfully",
-        "is_active": user.is_active
-    }
-
-
-@router.put("/users/{user_id}/reset-password")
-async def reset_user_password(
-    user_id: int,
-    admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Reset user password (Admin only)
-    """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # Generate new temporary password
-    import secrets
-    import string
-    new_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(12))
-
-    # Hash the new password
-    user.password_hash = get_password_hash(new_password)
-    db.commit()
-
-    logger.info(f"Admin {admin_user.employee_id} reset password for user {user.employee_id}")
-
-    return {
-        "message": "Password reset successfully",
-        "temporary_password": new_password
+        "is_active": is_active
     }
 
 
@@ -1176,8 +1599,14 @@ async def bulk_request_action(
             detail="No request IDs provided"
         )
 
-    # Get all requests
-    requests = db.query(TransportRequest).filter(
+    # Only the columns the actions branch on; the rows themselves are
+    # changed with one UPDATE per table rather than per-object flushes
+    requests = db.query(
+        TransportRequest.id,
+        TransportRequest.status,
+        TransportRequest.request_date,
+        TransportRequest.request_time
+    ).filter(
         TransportRequest.id.in_(bulk_data.request_ids)
     ).all()
 
@@ -1188,127 +1617,153 @@ async def bulk_request_action(
         )
 
     results = []
+    eligible_ids = []
 
-    for request in requests:
-        try:
-            if bulk_data.action == "approve":
-                if request.status != RequestStatus.PENDING:
-                    results.append({
-                        "request_id": request.id,
-                        "status": "skipped",
-                        "message": "Request not pending"
-                    })
-                    continue
-
-                # For bulk approval, we need vehicle and driver
-                if not bulk_data.vehicle_id or not bulk_data.driver_id:
-                    results.append({
-                        "request_id": request.id,
-                        "status": "failed",
-                        "message": "Vehicle and driver required for approval"
-                    })
-                    continue
-
-                # Check vehicle and driver availability
-                vehicle = db.query(Vehicle).filter(Vehicle.id == bulk_data.vehicle_id).first()
-                driver = db.query(Driver).filter(Driver.id == bulk_data.driver_id).first()
-
-                if not vehicle or not driver:
-                    results.append({
-                        "request_id": request.id,
-                        "status": "failed",
-                        "message": "Vehicle or driver not found"
-                    })
-                    continue
-
-                # Approve request
-                request.status = RequestStatus.APPROVED
-                request.approved_by = admin_user.id
-                request.approved_at = datetime.utcnow()
-
-                # Create assignment
-                assignment = VehicleAssignment(
-                    request_id=request.id,
-                    vehicle_id=bulk_data.vehicle_id,
-                    driver_id=bulk_data.driver_id,
-                    assigned_by=admin_user.id,
-                    assignment_date=request.request_date,
-                    estimated_departure=request.request_time,
-                    status=AssignmentStatus.ASSIGNED,
-                    notes=bulk_data.notes or "Bulk approval"
-                )
-
-                # Update driver availability to false when assigned
-                assigned_driver = db.query(Driver).filter(Driver.id == bulk_data.driver_id).first()
-                if assigned_driver:
-                    assigned_driver.is_available = False
+    if bulk_data.action == "approve":
+        # The same vehicle and driver serve the whole batch, so check them once
+        if bulk_data.vehicle_id and bulk_data.driver_id:
+            vehicle = db.get(Vehicle, bulk_data.vehicle_id)
+            driver = db.get(Driver, bulk_data.driver_id)
 
-                db.add(assignment)
+            if not vehicle or not driver:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Vehicle or driver not found"
+                )
 
+        new_assignments = []
+        for request in requests:
+            if request.status != RequestStatus.PENDING:
                 results.append({
                     "request_id": request.id,
-                    "status": "approved",
-                    "message": "Request approved successfully"
+                    "status": "skipped",
+                    "message": "Request not pending"
                 })
+                continue
 
-            elif bulk_data.action == "reject":
-                if request.status != RequestStatus.PENDING:
-                    results.append({
-                        "request_id": request.id,
-                        "status": "skipped",
-                        "message": "Request not pending"
-                    })
-                    continue
-
-                request.status = RequestStatus.REJECTED
-                request.rejection_reason = bulk_data.notes or "Bulk rejection"
-
+            # For bulk approval, we need vehicle and driver
+            if not bulk_data.vehicle_id or not bulk_data.driver_id:
                 results.append({
                     "request_id": request.id,
-                    "status": "rejected",
-                    "message": "Request rejected successfully"
+                    "status": "failed",
+                    "message": "Vehicle and driver required for approval"
                 })
+                continue
+
+            new_assignments.append({
+                "request_id": request.id,
+                "vehicle_id": bulk_data.vehicle_id,
+                "driver_id": bulk_data.driver_id,
+                "assigned_by": admin_user.id,
+                "assignment_date": request.request_date,
+                "estimated_departure": request.request_time,
+                "status": AssignmentStatus.ASSIGNED,
+                "notes": bulk_data.notes or "Bulk approval"
+            })
 
-            elif bulk_data.action == "cancel":
-                if request.status not in [RequestStatus.PENDING, RequestStatus.APPROVED]:
-                    results.append({
-                        "request_id": request.id,
-                        "status": "skipped",
-                        "message": "Request cannot be cancelled"
-                    })
-                    continue
-
-                request.status = RequestStatus.CANCELLED
-
-                # Cancel vehicle assignment if exists and restore driver availability
-                assignment = db.query(VehicleAssignment).filter(VehicleAssignment.request_id == request.id).first()
-                if assignment:
-                    assignment.status = AssignmentStatus.CANCELLED
-                    # Restore driver availability when assignment is cancelled
-                    if assignment.driver:
-                        assignment.driver.is_available = True
+            eligible_ids.append(request.id)
+            results.append({
+                "request_id": request.id,
+                "status": "approved",
+                "message": "Request approved successfully"
+            })
 
+        if eligible_ids:
+            db.query(TransportRequest).filter(
+                TransportRequest.id.in_(eligible_ids)
+            ).update({
+                TransportRequest.status: RequestStatus.APPROVED,
+                TransportRequest.approved_by: admin_user.id,
+                TransportRequest.approved_at: datetime.utcnow()
+            }, synchronize_session=False)
+
+            # Create all assignments in one executemany INSERT
+            db.execute(insert(VehicleAssignment), new_assignments)
+
+            # Update driver availability to false when assigned
+            db.query(Driver).filter(
+                Driver.id == bulk_data.driver_id
+            ).update({Driver.is_available: False}, synchronize_session=False)
+
+    elif bulk_data.action == "reject":
+        for request in requests:
+            if request.status != RequestStatus.PENDING:
                 results.append({
                     "request_id": request.id,
-                    "status": "cancelled",
-                    "message": "Request cancelled successfully"
+                    "status": "skipped",
+                    "message": "Request not pending"
                 })
+                continue
 
-            else:
+            eligible_ids.append(request.id)
+            results.append({
+                "request_id": request.id,
+                "status": "rejected",
+                "message": "Request rejected successfully"
+            })
+
+        if eligible_ids:
+            db.query(TransportRequest).filter(
+                TransportRequest.id.in_(eligible_ids)
+            ).update({
+                TransportRequest.status: RequestStatus.REJECTED,
+                TransportRequest.rejection_reason: bulk_data.notes or "Bulk rejection"
+            }, synchronize_session=False)
+
+    elif bulk_data.action == "cancel":
+        for request in requests:
+            if request.status not in CANCELLABLE_STATUSES:
                 results.append({
                     "request_id": request.id,
-                    "status": "failed",
-                    "message": f"Unknown action: {bulk_data.action}"
+                    "status": "skipped",
+                    "message": "Request cannot be cancelled"
                 })
+                continue
 
-        except Exception as e:
+            eligible_ids.append(request.id)
             results.append({
                 "request_id": request.id,
-                "status": "error",
-                "message": str(e)
+                "status": "cancelled",
+                "message": "Request cancelled successfully"
             })
 
+        if eligible_ids:
+            db.query(TransportRequest).filter(
+                TransportRequest.id.in_(eligible_ids)
+            ).update({
+                TransportRequest.status: RequestStatus.CANCELLED
+            }, synchronize_session=False)
+
+            # Restore availability of the drivers on the assignments being
+            # cancelled; done first, while those assignments are still active
+            db.query(Driver).filter(
+                Driver.id.in_(
+                    select(VehicleAssignment.driver_id).where(
+                        VehicleAssignment.request_id.in_(eligible_ids),
+                        VehicleAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)
+                    )
+                )
+            ).update({Driver.is_available: True}, synchronize_session=False)
+
+            # Cancel vehicle assignments of the cancelled requests
+            db.query(VehicleAssignment).filter(
+                VehicleAssignment.request_id.in_(eligible_ids)
+            ).update({
+                VehicleAssignment.status: AssignmentStatus.CANCELLED
+            }, synchronize_session=False)
+
+    else:
+        results = [
+            {
+                "request_id": request.id,
+                "status": "failed",
+                "message": f"Unknown action: {bulk_data.action}"
+            }
+            for request in requests
+        ]
+
     db.commit()
+    await invalidate_dashboard_cache(*(request.request_date for request in requests))
 
     logger.info(f"Admin {admin_user.employee_id} performed bulk {bulk_data.action} on {len(bulk_data.request_ids)} requests")
 
@@ -1316,5 +1771,5 @@ async def bulk_request_action(
         "message": f"Bulk {bulk_data.action} completed",
         "results": results,
         "total_processed": len(results),
-        "successful": len([r for r in results if r["status"] in ["approved", "rejected", "cancelled"]])
+        "successful": sum(r["status"] in BULK_SUCCESS_STATUSES for r in results)
     }
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.auth import (
     authenticate_user, create_access_token, create_refresh_token,
-    verify_token, get_current_active_user, get_password_hash, verify_password
+    verify_token, get_current_active_user, get_password_hash_async, verify_password_async,
+    password_needs_rehash, invalidate_user_cache
 )
 from app.models.user import User
 from app.schemas.auth import (
@@ -20,11 +24,11 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate user and return JWT tokens
     """
-    user = authenticate_user(db, login_data.employee_id, login_data.password)
+    user = await authenticate_user(db, login_data.employee_id, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,7 +38,11 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    # Bring the hash up to the configured cost while the plain password is at hand
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(login_data.password)
+    await db.commit()
+    invalidate_user_cache(user.employee_id)
     
     # Create tokens
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -54,7 +62,7 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
-async def refresh_token(refresh_data: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(refresh_data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Refresh access token using refresh token
     """
@@ -66,7 +74,7 @@ async def refresh_token(refresh_data: RefreshTokenRequest, db: Session = Depends
         )
     
     employee_id = payload.get("sub")
-    user = db.query(User).filter(User.employee_id == employee_id).first()
+    user = (await db.execute(select(User).where(User.employee_id == employee_id))).scalar_one_or_none()
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -117,8 +125,11 @@ async def update_profile(
     if profile_data.designation is not None:
         current_user.designation = profile_data.designation
     
-    db.commit()
-    db.refresh(current_user)
+    # current_user is bound to the sync session, so its commit and reload run
+    # in the threadpool rather than blocking the event loop
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, current_user)
+    invalidate_user_cache(current_user.employee_id)
     
     logger.info(f"User {current_user.employee_id} updated profile")
     
@@ -135,7 +146,7 @@ async def change_password(
     Change user password
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
@@ -149,8 +160,9 @@ async def change_password(
         )
 
     # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
-    db.commit()
+    current_user.password_hash = await get_password_hash_async(password_data.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_user_cache(current_user.employee_id)
 
     logger.info(f"User {current_user.employee_id} changed password")
 
@@ -172,7 +184,7 @@ async def verify_token_endpoint(current_user: User = Depends(get_current_active_
 @router.post("/refresh-access-token", response_model=TokenRefreshResponse)
 async def refresh_access_token_endpoint(
     refresh_data: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh access token using refresh token (enhanced version)
@@ -185,7 +197,7 @@ async def refresh_access_token_endpoint(
         )
 
     employee_id = payload.get("sub")
-    user = db.query(User).filter(User.employee_id == employee_id).first()
+    user = (await db.execute(select(User).where(User.employee_id == employee_id))).scalar_one_or_none()
 
     if not user or not user.is_active:
         raise HTTPException(
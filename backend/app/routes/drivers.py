@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy import and_, or_, func
+from sqlalchemy.exc import IntegrityError
 from typing import Optional
 from datetime import date, datetime, timedelta
 from app.database import get_db
-from app.auth import get_admin_user, get_current_active_user, get_password_hash
+from app.auth import get_admin_user, get_current_active_user, get_password_hash_async
+from app.cache import cache_get, cache_set, driver_count_cache_key, invalidate_driver_count_cache
 from app.models.user import User, UserRole
 from app.models.driver import Driver
 from app.models.vehicle_assignment import VehicleAssignment, AssignmentStatus
@@ -16,6 +19,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/drivers", tags=["Drivers"])
 
+# Paging through the list re-counted the same drivers on every page. Routes
+# that change drivers drop the totals, so the TTL only bounds other drift.
+DRIVER_COUNT_CACHE_TTL = 60
+
 
 class DriverCreate(BaseModel):
     employee_id: str
@@ -89,11 +96,17 @@ async def get_drivers(
     limit: int = Query(20, ge=1, le=100),
     is_active: Optional[bool] = None,
     is_available: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    count: bool = Query(True),
     admin_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all drivers (Admin only)
+
+    Pass the previous response's next_cursor as cursor to page by keyset
+    instead of OFFSET; cursor pages skip the total count. count=false skips
+    it on page requests too, leaving total and pages null.
     """
     query = db.query(Driver)
     
@@ -103,11 +116,53 @@ async def get_drivers(
     if is_available is not None:
         query = query.filter(Driver.is_available == is_available)
     
-    # Get total count
-    total = query.count()
+    if cursor is not None:
+        # Seek past the last employee_id seen; cost doesn't grow with depth
+        query = query.filter(Driver.employee_id > cursor)
+        offset = None
+    else:
+        # Get total count, cached briefly per filter combination
+        total = None
+        if count:
+            count_cache_key = driver_count_cache_key(is_active, is_available)
+            total = await cache_get(count_cache_key)
+            if total is None:
+                total = query.with_entities(func.count(Driver.id)).scalar()
+                await cache_set(count_cache_key, total, DRIVER_COUNT_CACHE_TTL)
+        
+        # Apply pagination
+        offset = (page - 1) * limit
+    
+    drivers = query.order_by(Driver.employee_id).offset(offset).limit(limit).all()
+    driver_ids = [driver.id for driver in drivers]
     
-    # Apply pagination
-    drivers = query.order_by(Driver.employee_id).offset((page - 1) * limit).limit(limit).all()
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+    
+    # Completed assignments in the last 30 days, counted for the whole page
+    # in one query rather than one per driver
+    assignments_counts = dict(db.query(
+        VehicleAssignment.driver_id,
+        func.count(VehicleAssignment.id)
+    ).join(TransportRequest).filter(
+        and_(
+            VehicleAssignment.driver_id.in_(driver_ids),
+            TransportRequest.request_date >= month_ago,
+            VehicleAssignment.status == AssignmentStatus.COMPLETED
+        )
+    ).group_by(VehicleAssignment.driver_id).all())
+    
+    # Current assignments of the page's drivers, loaded with their requests
+    current_assignments = {}
+    for assignment in db.query(VehicleAssignment).join(VehicleAssignment.request).options(
+        contains_eager(VehicleAssignment.request)
+    ).filter(
+        and_(
+            VehicleAssignment.driver_id.in_(driver_ids),
+            VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
+        )
+    ):
+        current_assignments.setdefault(assignment.driver_id, assignment)
     
     # Add additional info for each driver
     driver_responses = []
@@ -115,30 +170,13 @@ async def get_drivers(
         driver_dict = driver.to_dict()
         
         # Check license status
-        today = date.today()
         license_status = "valid"
         if driver.license_expiry <= today + timedelta(days=30):
             license_status = "expiring_soon"
         if driver.license_expiry <= today:
             license_status = "expired"
         
-        # Calculate assignments in last 30 days
-        month_ago = today - timedelta(days=30)
-        assignments_count = db.query(VehicleAssignment).join(TransportRequest).filter(
-            and_(
-                VehicleAssignment.driver_id == driver.id,
-                TransportRequest.request_date >= month_ago,
-                VehicleAssignment.status == AssignmentStatus.COMPLETED
-            )
-        ).count()
-        
-        # Get current assignment if any
-        current_assignment = db.query(VehicleAssignment).join(TransportRequest).filter(
-            and_(
-                VehicleAssignment.driver_id == driver.id,
-                VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-            )
-        ).first()
+        current_assignment = current_assignments.get(driver.id)
         
         current_assignment_info = None
         if current_assignment:
@@ -146,28 +184,37 @@ async def get_drivers(
                 "request_id": current_assignment.request_id,
                 "origin": current_assignment.request.origin,
                 "destination": current_assignment.request.destination,
-                "estimated_departure": current_assignment.estimated_departure.strftime("%H:%M:%S") if current_assignment.estimated_departure else None,
-                "estimated_arrival": current_assignment.estimated_arrival.strftime("%H:%M:%S") if current_assignment.estimated_arrival else None,
+                "estimated_departure": current_assignment.estimated_departure,
+                "estimated_arrival": current_assignment.estimated_arrival,
                 "status": current_assignment.status.value
             }
         
         driver_dict.update({
             "license_status": license_status,
-            "assignments_last_30_days": assignments_count,
+            "assignments_last_30_days": assignments_counts.get(driver.id, 0),
             "current_assignment": current_assignment_info
         })
         
         driver_responses.append(driver_dict)
     
-    return {
-        "drivers": driver_responses,
-        "pagination": {
+    next_cursor = drivers[-1].employee_id if len(drivers) == limit else None
+    if cursor is not None:
+        pagination = {"limit": limit, "cursor": cursor, "next_cursor": next_cursor}
+    else:
+        pagination = {
             "page": page,
             "limit": limit,
             "total": total,
-            "pages": (total + limit - 1) // limit
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": next_cursor
         }
-    }
+    
+    # Already plain JSON data, so hand it straight to orjson rather than
+    # walking every row again through jsonable_encoder
+    return ORJSONResponse({
+        "drivers": driver_responses,
+        "pagination": pagination
+    })
 
 
 @router.post("/")
@@ -179,28 +226,6 @@ async def create_driver(
     """
     Create new driver with automatic user account provisioning (Admin only)
     """
-    # Check if employee_id already exists in drivers table
-    existing_driver = db.query(Driver).filter(
-        Driver.employee_id == driver_data.employee_id
-    ).first()
-
-    if existing_driver:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Driver with this employee ID already exists"
-        )
-
-    # Check if license number already exists
-    existing_license = db.query(Driver).filter(
-        Driver.license_number == driver_data.license_number
-    ).first()
-
-    if existing_license:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Driver with this license number already exists"
-        )
-
     # Check if user account already exists
     existing_user = db.query(User).filter(
         User.employee_id == driver_data.employee_id
@@ -226,7 +251,7 @@ async def create_driver(
             )
 
         # Create user account for driver
-        hashed_password = get_password_hash(driver_data.password)
+        hashed_password = await get_password_hash_async(driver_data.password)
         user_account = User(
             employee_id=driver_data.employee_id,
             email=driver_data.email,
@@ -246,7 +271,9 @@ async def create_driver(
 
         logger.info(f"Admin {admin_user.employee_id} created user account for driver {driver_data.employee_id}")
 
-    # Create driver profile (exclude user account fields)
+    # Create driver profile (exclude user account fields). employee_id and
+    # license_number are UNIQUE, so the insert itself is the duplicate check;
+    # which one clashed is only looked up when it fails
     driver_dict = driver_data.dict(exclude={'email', 'password', 'create_user_account'})
     driver = Driver(**driver_dict)
     db.add(driver)
@@ -256,6 +283,7 @@ async def create_driver(
         db.refresh(driver)
         if user_account:
             db.refresh(user_account)
+        await invalidate_driver_count_cache()
 
         logger.info(f"Admin {admin_user.employee_id} created driver {driver.employee_id}")
 
@@ -277,6 +305,29 @@ async def create_driver(
 
         return response_data
 
+    except IntegrityError as e:
+        db.rollback()
+        conflict = db.query(Driver.employee_id, Driver.license_number).filter(
+            or_(
+                Driver.employee_id == driver_data.employee_id,
+                Driver.license_number == driver_data.license_number
+            )
+        ).first()
+        if conflict and conflict.employee_id == driver_data.employee_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Driver with this employee ID already exists"
+            )
+        if conflict:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Driver with this license number already exists"
+            )
+        logger.error(f"Error creating driver: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create driver and user account"
+        )
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating driver: {e}")
@@ -314,7 +365,12 @@ async def get_driver(
     
     # Add detailed assignment history for admin users
     if current_user.role.value in ['admin', 'super_admin']:
-        recent_assignments = db.query(VehicleAssignment).join(TransportRequest).join(User).filter(
+        # Requests, their users and vehicles are loaded for all 20 rows up
+        # front instead of lazily per assignment
+        recent_assignments = db.query(VehicleAssignment).options(
+            selectinload(VehicleAssignment.request).selectinload(TransportRequest.user),
+            selectinload(VehicleAssignment.vehicle)
+        ).filter(
             VehicleAssignment.driver_id == driver_id
         ).order_by(VehicleAssignment.assignment_date.desc()).limit(20).all()
         
@@ -366,28 +422,30 @@ async def update_driver(
             detail="Driver not found"
         )
     
-    # Check for duplicate license number if updating
-    if driver_data.license_number and driver_data.license_number != driver.license_number:
-        existing_license = db.query(Driver).filter(
-            and_(
-                Driver.license_number == driver_data.license_number,
-                Driver.id != driver_id
-            )
-        ).first()
-        
-        if existing_license:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Another driver with this license number already exists"
-            )
-    
     # Update fields
     update_data = driver_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(driver, field, value)
     
-    db.commit()
+    # license_number is UNIQUE, so a duplicate is caught by the update itself
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing_license = db.query(Driver.id).filter(
+            and_(
+                Driver.license_number == driver_data.license_number,
+                Driver.id != driver_id
+            )
+        ).first()
+        if not existing_license:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Another driver with this license number already exists"
+        )
     db.refresh(driver)
+    await invalidate_driver_count_cache()
     
     logger.info(f"Admin {admin_user.employee_id} updated driver {driver.employee_id}")
     
@@ -438,6 +496,7 @@ async def delete_driver(
         driver.is_active = False
         driver.is_available = False
         db.commit()
+        await invalidate_driver_count_cache()
 
         logger.info(f"Admin {admin_user.employee_id} soft-deleted driver {driver.employee_id} (has historical assignments)")
         return {"message": "Driver deleted successfully", "type": "soft_delete"}
@@ -445,6 +504,7 @@ async def delete_driver(
         # Hard delete for drivers with no historical data
         db.delete(driver)
         db.commit()
+        await invalidate_driver_count_cache()
 
         logger.info(f"Admin {admin_user.employee_id} hard-deleted driver {driver.employee_id} (no historical assignments)")
         return {"message": "Driver deleted successfully", "type": "hard_delete"}
@@ -458,35 +518,37 @@ async def get_available_drivers(
     """
     Get currently available drivers
     """
+    today = date.today()
     available_drivers = db.query(Driver).filter(
         and_(
             Driver.is_active == True,
             Driver.is_available == True,
-            Driver.license_expiry > date.today()
+            Driver.license_expiry > today
         )
     ).all()
     
+    # Active assignments today, counted for all the drivers in one query
+    today_assignments = dict(db.query(
+        VehicleAssignment.driver_id,
+        func.count(VehicleAssignment.id)
+    ).join(TransportRequest).filter(
+        and_(
+            VehicleAssignment.driver_id.in_([driver.id for driver in available_drivers]),
+            TransportRequest.request_date == today,
+            VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
+        )
+    ).group_by(VehicleAssignment.driver_id).all())
+    
     driver_responses = []
     for driver in available_drivers:
         driver_dict = driver.to_dict()
-        
-        # Check if driver has any assignments today
-        today = date.today()
-        today_assignments = db.query(VehicleAssignment).join(TransportRequest).filter(
-            and_(
-                VehicleAssignment.driver_id == driver.id,
-                TransportRequest.request_date == today,
-                VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
-            )
-        ).count()
-        
-        driver_dict['assignments_today'] = today_assignments
+        driver_dict['assignments_today'] = today_assignments.get(driver.id, 0)
         driver_responses.append(driver_dict)
     
-    return {
+    return ORJSONResponse({
         "available_drivers": driver_responses,
         "count": len(driver_responses)
-    }
+    })
 
 
 @router.put("/{driver_id}/availability")
@@ -511,6 +573,7 @@ async def update_driver_availability(
 
     db.commit()
     db.refresh(driver)
+    await invalidate_driver_count_cache()
 
     logger.info(f"Admin {admin_user.employee_id} updated availability for driver {driver.employee_id} to {availability_data.is_available}")
 
@@ -542,6 +605,7 @@ async def toggle_driver_status(
     # Toggle the status
     driver.is_active = not driver.is_active
     db.commit()
+    await invalidate_driver_count_cache()
 
     status_text = "activated" if driver.is_active else "deactivated"
     logger.info(f"Admin {admin_user.employee_id} {status_text} driver {driver.employee_id}")
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import Optional, Dict, Any
+from typing import Optional
 from datetime import datetime
 from app.database import get_db
 from app.auth import get_current_active_user, get_admin_user
 from app.models.user import User
 from app.models.transport_request import TransportRequest
 from app.models.vehicle_assignment import VehicleAssignment, AssignmentStatus
+from app.trip_locations import (
+    add_trip_location, clear_trip_locations, get_latest_trip_location,
+    get_trip_location_summaries, get_trip_locations
+)
 from pydantic import BaseModel
 import logging
 
@@ -34,10 +39,6 @@ class TripLocation(BaseModel):
     driver_id: Optional[str] = None
 
 
-# In-memory storage for demo (in production, use Redis or database)
-trip_locations: Dict[int, list] = {}
-
-
 @router.post("/update-location/{trip_id}")
 async def update_location(
     trip_id: int,
@@ -81,9 +82,6 @@ async def update_location(
             logger.info(f"Transport user {current_user.employee_id} (no driver profile) updating trip {trip_id}")
     
     # Store location update
-    if trip_id not in trip_locations:
-        trip_locations[trip_id] = []
-    
     location_entry = TripLocation(
         trip_id=trip_id,
         latitude=location_data.latitude,
@@ -94,11 +92,12 @@ async def update_location(
         driver_id=current_user.employee_id
     )
     
-    trip_locations[trip_id].append(location_entry.dict())
-    
-    # Keep only last 100 locations per trip
-    if len(trip_locations[trip_id]) > 100:
-        trip_locations[trip_id] = trip_locations[trip_id][-100:]
+    # Stored in Redis and capped at the last 100 locations per trip
+    if not await add_trip_location(trip_id, location_entry.dict()):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Location tracking is temporarily unavailable"
+        )
     
     logger.info(f"Location updated for trip {trip_id} by {current_user.employee_id}")
     
@@ -149,7 +148,7 @@ async def track_trip(
         )
     
     # Get trip locations
-    locations = trip_locations.get(trip_id, [])
+    locations = await get_trip_locations(trip_id)
     
     # Get trip details
     assignment = db.query(VehicleAssignment).filter(
@@ -165,7 +164,9 @@ async def track_trip(
         "last_update": locations[-1]["timestamp"] if locations else None
     }
     
-    return trip_data
+    # Location history can run to 100 entries, so it goes straight to orjson
+    # rather than through jsonable_encoder
+    return ORJSONResponse(trip_data)
 
 
 @router.get("/trip/{trip_id}/location")
@@ -215,9 +216,9 @@ async def get_trip_location(
         )
 
     # Get latest location
-    locations = trip_locations.get(trip_id, [])
+    current_location = await get_latest_trip_location(trip_id)
 
-    if not locations:
+    if current_location is None:
         # Generate a sample location if no real data exists
         import random
         base_lat = 12.9716
@@ -230,8 +231,6 @@ async def get_trip_location(
             "heading": random.uniform(0, 360),
             "accuracy": random.uniform(5.0, 15.0)
         }
-    else:
-        current_location = locations[-1]
 
     return current_location
 
@@ -289,7 +288,7 @@ async def get_trip_data(
     ).first()
 
     # Get latest location data
-    locations = trip_locations.get(trip_id, [])
+    locations = await get_trip_locations(trip_id)
 
     if not locations:
         # Generate sample tracking data if no real data exists
@@ -355,10 +354,15 @@ async def get_active_trips(
         VehicleAssignment.status.in_([AssignmentStatus.ASSIGNED, AssignmentStatus.IN_PROGRESS])
     ).all()
     
+    # Latest location and count of every trip, in one Redis round-trip
+    location_summaries = await get_trip_location_summaries(
+        assignment.request_id for assignment in active_assignments
+    )
+    
     active_trips = []
     for assignment in active_assignments:
         trip_id = assignment.request_id
-        locations = trip_locations.get(trip_id, [])
+        current_location, location_count = location_summaries[trip_id]
         
         trip_data = {
             "trip_id": trip_id,
@@ -366,16 +370,16 @@ async def get_active_trips(
             "assignment": assignment.to_dict(),
             "vehicle": assignment.vehicle.to_dict(),
             "driver": assignment.driver.to_dict(),
-            "current_location": locations[-1] if locations else None,
-            "location_count": len(locations)
+            "current_location": current_location,
+            "location_count": location_count
         }
         
         active_trips.append(trip_data)
     
-    return {
+    return ORJSONResponse({
         "active_trips": active_trips,
         "count": len(active_trips)
-    }
+    })
 
 
 @router.delete("/trip-data/{trip_id}")
@@ -387,8 +391,13 @@ async def clear_trip_data(
     """
     Clear GPS data for a trip (Admin only)
     """
-    if trip_id in trip_locations:
-        del trip_locations[trip_id]
+    cleared = await clear_trip_locations(trip_id)
+    if cleared is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Location tracking is temporarily unavailable"
+        )
+    if cleared:
         logger.info(f"Admin {admin_user.employee_id} cleared GPS data for trip {trip_id}")
         return {"message": "Trip GPS data cleared successfully"}
     else:
@@ -7,6 +7,7 @@ import logging
 
 from app.database import get_db
 from app.auth import get_current_active_user
+from app.cache import invalidate_dashboard_cache
 from app.models.user import User, UserRole
 from app.models.transport_request import TransportRequest, RequestStatus
 from app.models.vehicle_assignment import VehicleAssignment, AssignmentStatus
@@ -218,8 +219,12 @@ async def complete_trip(
     if assignment.driver:
         assignment.driver.is_available = True
 
+    # Read before commit expires the row
+    request_dates = [assignment.request.request_date] if assignment.request else []
     db.commit()
     db.refresh(assignment)
+    # Trip and driver counters changed; this also drops the driver list totals
+    await invalidate_dashboard_cache(*request_dates)
     
     logger.info(f"Driver {transport_user.employee_id} completed trip {assignment_id}")
     
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from typing import Optional
 from datetime import datetime
 from app.database import get_db
 from app.auth import get_current_active_user, get_admin_user
+from app.cache import invalidate_dashboard_cache
 from app.models.user import User
 from app.models.transport_request import TransportRequest, RequestStatus
 from app.models.vehicle_assignment import VehicleAssignment, AssignmentStatus
@@ -79,6 +80,8 @@ async def create_request(
     db.add(db_request)
     db.commit()
     db.refresh(db_request)
+    # New pending request shows up in the admin dashboard counters
+    await invalidate_dashboard_cache()
     
     logger.info(f"User {current_user.employee_id} created transport request {db_request.id}")
     
@@ -102,7 +105,7 @@ async def get_user_requests(
         query = query.filter(TransportRequest.status == status)
     
     # Get total count
-    total = query.count()
+    total = query.with_entities(func.count(TransportRequest.id)).scalar()
     
     # Apply pagination
     requests = query.order_by(TransportRequest.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
@@ -261,7 +264,10 @@ async def cancel_request(
         if assignment.driver:
             assignment.driver.is_available = True
     
+    # Read before commit expires the row
+    request_date = request.request_date
     db.commit()
+    await invalidate_dashboard_cache(request_date)
     
     logger.info(f"User {current_user.employee_id} cancelled request {request_id}")
     
@@ -66,7 +66,7 @@ async def get_vehicles(
         query = query.filter(Vehicle.is_active == is_active)
     
     # Get total count
-    total = query.count()
+    total = query.with_entities(func.count(Vehicle.id)).scalar()
     
     # Apply pagination
     vehicles = query.order_by(Vehicle.vehicle_number).offset((page - 1) * limit).limit(limit).all()
@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from redis.exceptions import RedisError
+from app.cache import mark_redis_unavailable, redis_available, redis_client
+import orjson
+
+# GPS positions live in Redis rather than process memory so that every
+# worker sees the same trip history. Each trip keeps its latest positions,
+# oldest first, in a list capped at TRIP_LOCATION_LIMIT entries. Redis
+# errors go through app.cache's circuit breaker: reads then return no
+# history and writes report failure instead of raising.
+TRIP_LOCATION_PREFIX = "hal-gps:trip"
+TRIP_LOCATION_LIMIT = 100
+
+# Trips nobody updates any more expire a day after their last position
+TRIP_LOCATION_TTL = 24 * 60 * 60
+
+
+def _trip_key(trip_id: int) -> str:
+    return f"{TRIP_LOCATION_PREFIX}:{trip_id}:locations"
+
+
+async def add_trip_location(trip_id: int, location: dict) -> bool:
+    """Append a position and trim the trip to its latest TRIP_LOCATION_LIMIT,
+    atomically; False if Redis is unavailable"""
+    if not redis_available():
+        return False
+    key = _trip_key(trip_id)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, orjson.dumps(location))
+            pipe.ltrim(key, -TRIP_LOCATION_LIMIT, -1)
+            pipe.expire(key, TRIP_LOCATION_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return False
+    return True
+
+
+async def get_trip_locations(trip_id: int) -> List[dict]:
+    """All stored positions of a trip, oldest first; empty if Redis is unavailable"""
+    if not redis_available():
+        return []
+    try:
+        values = await redis_client.lrange(_trip_key(trip_id), 0, -1)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return []
+    return [orjson.loads(value) for value in values]
+
+
+async def get_latest_trip_location(trip_id: int) -> Optional[dict]:
+    """The trip's most recent position, or None if it has none or Redis is unavailable"""
+    if not redis_available():
+        return None
+    try:
+        value = await redis_client.lindex(_trip_key(trip_id), -1)
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+    return orjson.loads(value) if value is not None else None
+
+
+async def get_trip_location_summaries(trip_ids: Iterable[int]) -> Dict[int, Tuple[Optional[dict], int]]:
+    """Latest position and position count per trip, read in one round-trip"""
+    trip_ids = list(trip_ids)
+    empty = {trip_id: (None, 0) for trip_id in trip_ids}
+    if not trip_ids or not redis_available():
+        return empty
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for trip_id in trip_ids:
+                pipe.lindex(_trip_key(trip_id), -1)
+                pipe.llen(_trip_key(trip_id))
+            results = await pipe.execute()
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return empty
+
+    return {
+        trip_id: (orjson.loads(latest) if latest is not None else None, count)
+        for trip_id, latest, count in zip(trip_ids, results[::2], results[1::2])
+    }
+
+
+async def clear_trip_locations(trip_id: int) -> Optional[bool]:
+    """Drop a trip's positions; False if it had none, None if Redis is unavailable"""
+    if not redis_available():
+        return None
+    try:
+        return await redis_client.delete(_trip_key(trip_id)) > 0
+    except RedisError as e:
+        mark_redis_unavailable(e)
+        return None
@@ -8,17 +8,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
-from passlib.context import CryptContext
 from app.models.user import User, UserRole
 from app.database import Base
+import bcrypt
 import os
 from decouple import config
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    rounds = config("BCRYPT_ROUNDS", default=12, cast=int)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
 
 def create_default_users():
     """Create default users for the system"""
@@ -1,14 +1,16 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
 
 # Import application modules
 from app.config import settings
-from app.database import init_db, check_db_connection
+from app.database import init_db, check_db_connection, async_engine
+from app.rollups import refresh_daily_request_stats_periodically
 from app.routes import auth, transport_requests, admin, vehicles, drivers, analytics, ml, gps, transport
 
 # Configure logging
@@ -44,12 +46,17 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
     
+    # Keep the analytics rollup current in the background
+    rollup_task = asyncio.create_task(refresh_daily_request_stats_periodically())
+    
     logger.info("Application startup complete")
     
     yield
     
     # Shutdown
     logger.info("Shutting down HAL Transport Management System...")
+    rollup_task.cancel()
+    await async_engine.dispose()
 
 
 # Create FastAPI application
@@ -59,6 +66,7 @@ app = FastAPI(
     description="Smart Vehicle Transport Management System for Hindustan Aeronautics Limited (HAL)",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
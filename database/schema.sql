@@ -112,6 +112,18 @@ CREATE TABLE vehicle_assignments (
 	FOREIGN KEY(driver_id) REFERENCES drivers (id)
 );
 
+-- Daily request stats - per-day request counts by status and route for the
+-- analytics reports, rebuilt from transport_requests by the application
+CREATE TABLE daily_request_stats (
+	stat_date DATE NOT NULL, 
+	status VARCHAR(9), 
+	origin VARCHAR(255) NOT NULL, 
+	destination VARCHAR(255) NOT NULL, 
+	request_count INTEGER NOT NULL, 
+	passenger_requests INTEGER NOT NULL, 
+	passenger_count INTEGER
+);
+
 -- ============================================
 -- INDEXES FOR PERFORMANCE
 -- ============================================
@@ -120,6 +132,7 @@ CREATE TABLE vehicle_assignments (
 CREATE UNIQUE INDEX ix_users_employee_id ON users (employee_id);
 CREATE INDEX ix_users_id ON users (id);
 CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_users_department ON users (department);
 
 -- Vehicle indexes
 CREATE UNIQUE INDEX ix_vehicles_vehicle_number ON vehicles (vehicle_number);
@@ -131,9 +144,20 @@ CREATE UNIQUE INDEX ix_drivers_employee_id ON drivers (employee_id);
 
 -- Transport request indexes
 CREATE INDEX ix_transport_requests_id ON transport_requests (id);
+CREATE INDEX ix_transport_requests_status_request_date ON transport_requests (status, request_date);
+CREATE INDEX ix_transport_requests_created_at_status ON transport_requests (created_at, status);
+CREATE INDEX ix_transport_requests_request_date_status ON transport_requests (request_date, status);
 
 -- Vehicle assignment indexes
 CREATE INDEX ix_vehicle_assignments_id ON vehicle_assignments (id);
+CREATE INDEX ix_vehicle_assignments_status_vehicle_id ON vehicle_assignments (status, vehicle_id);
+CREATE INDEX ix_vehicle_assignments_status_driver_id ON vehicle_assignments (status, driver_id);
+CREATE INDEX ix_vehicle_assignments_request_id ON vehicle_assignments (request_id);
+CREATE INDEX ix_vehicle_assignments_vehicle_id_assignment_date ON vehicle_assignments (vehicle_id, assignment_date);
+CREATE INDEX ix_vehicle_assignments_driver_id_assignment_date ON vehicle_assignments (driver_id, assignment_date);
+
+-- Daily request stats indexes
+CREATE UNIQUE INDEX ix_daily_request_stats_date_status_route ON daily_request_stats (stat_date, status, origin, destination);
 
 -- ============================================
 -- ENUM VALUES REFERENCE